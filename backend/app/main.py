@@ -2,33 +2,95 @@
 Keep Tahoe Blue API - OCR Form Processing Backend
 """
 
-import base64
+import asyncio
 import csv
-import json
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
+from functools import cache
 from io import BytesIO, StringIO
+from operator import itemgetter
 from pathlib import Path
 from threading import Lock
-from typing import Any
-from uuid import UUID
-
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from typing import Annotated, Any, AsyncIterator, Callable
+
+import cv2
+import numpy as np
+import orjson
+import pybase64
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from PIL import Image
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError, WithJsonSchema
+
+from .ocr import (
+    OCR_POOL_SIZE,
+    OcrCategoryResult,
+    OcrFieldResult,
+    OcrFormResult,
+    process_images,
+    warm_up_ocr,
+)
 
-from .ocr import OcrCategoryResult, OcrFieldResult, OcrFormResult, process_image
+
+logger = logging.getLogger(__name__)
 
 SCHEMA_FILE = Path(__file__).parent / "data" / "form_schema.json"
 DEFAULT_SCHEMA_FILE = Path(__file__).parent / "data" / "default-schema.json"
-SCHEMA_LOCK = Lock()
+SCHEMA_LOCK = Lock()  # serializes schema writers; readers never take it
+
+# Shared pool for per-image decode/encode work in /upload
+UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(os.cpu_count() or 1, 8), thread_name_prefix="upload"
+)
+
+# OCR batches run here, apart from decode/encode work: one worker per pooled
+# OCR instance, plus one to extract fields from a finished batch while every
+# instance is busy with inference
+OCR_EXECUTOR = ThreadPoolExecutor(
+    max_workers=OCR_POOL_SIZE + 1, thread_name_prefix="ocr"
+)
+
+# A prepared image waits at most OCR_BATCH_WAIT seconds for others to join
+# its OCR batch; a batch is sent as soon as it holds OCR_BATCH_SIZE images
+OCR_BATCH_SIZE = 8
+OCR_BATCH_WAIT = 0.05
+
+# Recently OCR'd forms keyed by (schema updated_at, image content hash), so a
+# resubmitted image skips OCR. Bounded LRU; FORM_CACHE_LOCK guards it.
+FORM_CACHE_SIZE = 256
+FORM_CACHE_LOCK = Lock()
+_form_cache: OrderedDict[tuple[str, bytes], "KTBForm"] = OrderedDict()
+
+# Current schema, keyed by SCHEMA_FILE's (path, mtime_ns, size). Replaced
+# wholesale (never mutated) so readers can use it without locking.
+_schema_cache: tuple[tuple[Path, int, int], "FormSchemaOutput"] | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load and warm up the OCR models before serving the first request."""
+    await asyncio.to_thread(warm_up_ocr)
+    yield
+
 
 app = FastAPI(
     title="Keep Tahoe Blue API",
     description="Backend API for OCR form processing",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -49,6 +111,15 @@ class FieldStatus(str, Enum):
     ERROR = "error"
 
 
+# Minimum OCR confidence for a field to be "confident"
+CONFIDENCE_THRESHOLD = 0.95
+
+# Pre-resolved statuses for the per-field hot path
+_CONFIDENT = FieldStatus.CONFIDENT
+_NEEDS_VALIDATION = FieldStatus.NEEDS_VALIDATION
+_ERROR = FieldStatus.ERROR
+
+
 class FieldSchemaInput(BaseModel):
     """Schema definition for a single field."""
 
@@ -81,7 +152,10 @@ class FilePayload(BaseModel):
     name: str
     type: str
     size: int
-    base64: str
+    # Base64 text, validated straight from the JSON body into bytes so the
+    # decoder does not have to encode a str copy back to ASCII. Documented
+    # as the plain string clients send, not as binary.
+    base64: Annotated[bytes, WithJsonSchema({"type": "string"})]
 
 
 class UploadPayload(BaseModel):
@@ -90,7 +164,36 @@ class UploadPayload(BaseModel):
     metadata: str
 
 
-class KTBFormField(BaseModel):
+# (category name, field names) for each schema category, in schema order.
+# Built once per upload so per-image work skips walking the schema models.
+SchemaPlan = list[tuple[str, tuple[str, ...]]]
+
+
+def build_schema_plan(schema: FormSchemaOutput) -> SchemaPlan:
+    """
+    Flatten a form schema into the category/field names used per image.
+
+    Args:
+        schema: Form schema defining expected categories and fields
+
+    Returns:
+        SchemaPlan with one (category name, field names) entry per category
+    """
+    return [
+        (category.name, tuple(field.name for field in category.fields))
+        for category in schema.categories
+    ]
+
+
+# The KTBForm* types below are built internally from OCR output, never from
+# request data, so they are plain dataclasses instead of validated models.
+
+# Stand-in for schema fields the OCR result does not mention
+MISSING_OCR_FIELD = OcrFieldResult(value=None, confidence=1.0)
+
+
+@dataclass(slots=True, frozen=True)
+class KTBFormField:
     """A field in the form with validated OCR results."""
 
     name: str
@@ -126,22 +229,34 @@ class KTBFormField(BaseModel):
         if confidence is None:
             confidence = 0.0
 
-        # Try to convert to integer
-        try:
-            int_value = int(value)
-            value_str = str(int_value)
-        except (ValueError, TypeError):
-            # Cannot convert to integer - return error status
-            return cls(name=name, value=str(value), status=FieldStatus.ERROR)
+        # Fast paths for values that are already canonical integers: ints
+        # (not bools) and ASCII digit strings without leading zeros
+        if type(value) is int:
+            value_str = str(value)
+        elif (
+            type(value) is str
+            and value.isascii()
+            and value.isdigit()
+            and (value[0] != "0" or value == "0")
+        ):
+            value_str = value
+        else:
+            # Try to convert to integer
+            try:
+                value_str = str(int(value))
+            except (ValueError, TypeError):
+                # Cannot convert to integer - return error status
+                return cls(name=name, value=str(value), status=_ERROR)
 
         # Check confidence threshold
-        if confidence < 0.95:
-            return cls(name=name, value=value_str, status=FieldStatus.NEEDS_VALIDATION)
+        if confidence < CONFIDENCE_THRESHOLD:
+            return cls(name=name, value=value_str, status=_NEEDS_VALIDATION)
 
-        return cls(name=name, value=value_str, status=FieldStatus.CONFIDENT)
+        return cls(name=name, value=value_str, status=_CONFIDENT)
 
 
-class KTBFormCategory(BaseModel):
+@dataclass(slots=True, frozen=True)
+class KTBFormCategory:
     """A category in the form."""
 
     name: str
@@ -149,52 +264,57 @@ class KTBFormCategory(BaseModel):
 
     @classmethod
     def from_ocr_category(
-        cls, category_schema: CategorySchemaInput, ocr_category: OcrCategoryResult
+        cls,
+        name: str,
+        field_names: tuple[str, ...],
+        ocr_category: OcrCategoryResult,
     ) -> "KTBFormCategory":
         """
         Create a KTBFormCategory from schema and OCR results.
 
         Args:
-            category_schema: Schema definition for this category
+            name: Category name from the schema
+            field_names: Field names the schema expects in this category
             ocr_category: Raw OCR results for this category
 
         Returns:
             KTBFormCategory with validated fields
         """
-        fields = []
-        for field_schema in category_schema.fields:
-            ocr_field = ocr_category.fields.get(
-                field_schema.name, OcrFieldResult(value=None, confidence=1.0)
+        ocr_fields = ocr_category.fields
+        fields = [
+            KTBFormField.from_ocr_field(
+                field_name, ocr_fields.get(field_name, MISSING_OCR_FIELD)
             )
-            fields.append(KTBFormField.from_ocr_field(field_schema.name, ocr_field))
-        return cls(name=category_schema.name, fields=fields)
+            for field_name in field_names
+        ]
+        return cls(name=name, fields=fields)
 
 
-class KTBForm(BaseModel):
+@dataclass(slots=True, frozen=True)
+class KTBForm:
     """Complete validated form."""
 
     categories: list[KTBFormCategory]
 
     @classmethod
-    def from_ocr_form(
-        cls, schema: FormSchemaOutput, ocr_form: OcrFormResult
-    ) -> "KTBForm":
+    def from_ocr_form(cls, plan: SchemaPlan, ocr_form: OcrFormResult) -> "KTBForm":
         """
         Create a KTBForm from schema and OCR results.
 
         Args:
-            schema: Form schema defining expected categories and fields
+            plan: Flattened form schema from build_schema_plan()
             ocr_form: Raw OCR results for the entire form
 
         Returns:
             KTBForm with validated categories and fields
         """
+        ocr_categories = ocr_form.categories
         categories = []
-        for category_schema in schema.categories:
-            ocr_category = ocr_form.categories.get(category_schema.name)
+        for name, field_names in plan:
+            ocr_category = ocr_categories.get(name)
             if ocr_category:
                 categories.append(
-                    KTBFormCategory.from_ocr_category(category_schema, ocr_category)
+                    KTBFormCategory.from_ocr_category(name, field_names, ocr_category)
                 )
         return cls(categories=categories)
 
@@ -213,10 +333,17 @@ class UploadResponse(BaseModel):
     results: list[KTBFormResult]
 
 
+class UploadError(BaseModel):
+    """A streamed upload image that could not be processed."""
+
+    uuid: str
+    error: str
+
+
 class UploadMetadata(BaseModel):
     """Metadata for an uploaded file."""
 
-    uuid: UUID
+    uuid: str
     metadata: dict[str, Any] = Field(default_factory=dict)
 
 
@@ -250,10 +377,110 @@ class CsvGenerationRequest(BaseModel):
     cleanup_data: list[CsvFormCategory] = Field(alias="clean-up-data")
 
 
+# Request body validators, built once at import instead of per request
+UPLOAD_PAYLOAD_ADAPTER = TypeAdapter(UploadPayload)
+UPLOAD_METADATA_ADAPTER = TypeAdapter(list[UploadMetadata])
+UPLOAD_RESULT_ADAPTER = TypeAdapter(KTBFormResult)
+UPLOAD_ERROR_ADAPTER = TypeAdapter(UploadError)
+CSV_REQUEST_ADAPTER = TypeAdapter(CsvGenerationRequest)
+
+MAX_UPLOAD_IMAGES = 100
+
+
+async def parse_request_body(request: Request, adapter: TypeAdapter) -> Any:
+    """
+    Validate a raw JSON request body with a prebuilt TypeAdapter.
+
+    Validation runs in a worker thread so that multi-megabyte upload bodies
+    do not block the event loop.
+
+    Args:
+        request: Incoming request whose body is JSON
+        adapter: TypeAdapter for the expected body model
+
+    Returns:
+        Validated body model
+
+    Raises:
+        RequestValidationError: If the body is not valid for the model (422)
+    """
+    body = await request.body()
+    try:
+        return await asyncio.to_thread(adapter.validate_json, body)
+    except ValidationError as e:
+        raise RequestValidationError(body_errors(e)) from e
+
+
+def body_errors(error: ValidationError) -> list[dict[str, Any]]:
+    """
+    Shape a body ValidationError's errors like FastAPI's own 422 details.
+
+    Locations get FastAPI's "body" prefix. Invalid JSON reports an empty
+    input instead of echoing the raw body, which can be megabytes of base64.
+    """
+    errors = []
+    for detail in error.errors(include_url=False):
+        detail["loc"] = ("body", *detail["loc"])
+        if detail["type"] == "json_invalid":
+            detail["input"] = {}
+        errors.append(detail)
+    return errors
+
+
+def request_body_openapi(adapter: TypeAdapter) -> dict[str, Any]:
+    """
+    OpenAPI operation fields for a route that validates its body itself.
+
+    Routes taking a raw Request have no body parameter for FastAPI to
+    document; this restores the requestBody and 422 response FastAPI would
+    generate. The model itself is added to the components by openapi().
+    """
+    name = adapter.json_schema()["title"]
+    return {
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": f"#/components/schemas/{name}"}
+                }
+            },
+            "required": True,
+        },
+        "responses": {
+            "422": {
+                "description": "Validation Error",
+                "content": {
+                    "application/json": {
+                        "schema": {"$ref": "#/components/schemas/HTTPValidationError"}
+                    }
+                },
+            }
+        },
+    }
+
+
+def openapi() -> dict[str, Any]:
+    """FastAPI's OpenAPI schema, plus the body models of raw-body routes."""
+    if app.openapi_schema is None:
+        schema = FastAPI.openapi(app)
+        components = schema.setdefault("components", {}).setdefault("schemas", {})
+        for adapter in (UPLOAD_PAYLOAD_ADAPTER, CSV_REQUEST_ADAPTER):
+            body = adapter.json_schema(ref_template="#/components/schemas/{model}")
+            components.update(body.pop("$defs", {}))
+            components[body["title"]] = body
+    return app.openapi_schema
+
+
+app.openapi = openapi
+
+
+@cache
 def get_default_schema() -> FormSchemaInput:
     """
     Get the default form schema from the default-schema.json file.
 
+    The file is read and parsed once; later calls return the same instance,
+    so callers must not mutate it (use model_copy() for a private copy).
+
     Returns:
         Default form schema with all expected categories and fields
 
@@ -266,7 +493,7 @@ def get_default_schema() -> FormSchemaInput:
             f"Default schema file not found at {DEFAULT_SCHEMA_FILE}"
         )
 
-    data = json.loads(DEFAULT_SCHEMA_FILE.read_text())
+    data = orjson.loads(DEFAULT_SCHEMA_FILE.read_bytes())
     return FormSchemaInput(**data)
 
 
@@ -275,17 +502,39 @@ def get_schema() -> FormSchemaOutput:
     Retrieve the current form schema from JSON file.
     If no schema exists, creates and returns the default schema.
 
+    The parsed schema is cached and only re-read when the file's mtime or
+    size changes. Readers never take SCHEMA_LOCK: save_schema() replaces
+    the file atomically and swaps in the new cached schema.
+
     Returns:
         FormSchemaOutput with current or default schema
     """
-    if not SCHEMA_FILE.exists():
+    global _schema_cache
+
+    key = _schema_cache_key()
+    if key is None:
         # Create default schema
         default_schema = get_default_schema()
         return save_schema(default_schema)
 
-    with SCHEMA_LOCK:
-        data = json.loads(SCHEMA_FILE.read_text())
-        return FormSchemaOutput(**data)
+    cached = _schema_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    # The file is only ever replaced atomically, so this sees a whole schema
+    data = orjson.loads(SCHEMA_FILE.read_bytes())
+    schema = FormSchemaOutput(**data)
+    _schema_cache = (key, schema)
+    return schema
+
+
+def _schema_cache_key() -> tuple[Path, int, int] | None:
+    """Return the cache key for SCHEMA_FILE, or None if it does not exist."""
+    try:
+        stat = SCHEMA_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return (SCHEMA_FILE, stat.st_mtime_ns, stat.st_size)
 
 
 def save_schema(schema: FormSchemaInput) -> FormSchemaOutput:
@@ -298,6 +547,8 @@ def save_schema(schema: FormSchemaInput) -> FormSchemaOutput:
     Returns:
         FormSchemaOutput with updated timestamp
     """
+    global _schema_cache
+
     # Ensure data directory exists
     SCHEMA_FILE.parent.mkdir(parents=True, exist_ok=True)
 
@@ -306,8 +557,85 @@ def save_schema(schema: FormSchemaInput) -> FormSchemaOutput:
             "categories": [cat.model_dump() for cat in schema.categories],
             "updated_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
         }
-        SCHEMA_FILE.write_text(json.dumps(data, indent=2))
-        return FormSchemaOutput(**data)
+        _atomic_write_bytes(
+            SCHEMA_FILE, orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        )
+        saved = FormSchemaOutput(**data)
+        _schema_cache = (_schema_cache_key(), saved)
+        return saved
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a file so readers see either the old or the new content.
+
+    Args:
+        path: Destination file
+        data: Content to write
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Chunks an uploaded PNG may carry and still be passed through as-is: pixel
+# data, plus the small physical-size and sRGB markers many encoders add
+PASSTHROUGH_PNG_CHUNKS = frozenset({b"IHDR", b"IDAT", b"IEND", b"pHYs", b"sRGB"})
+
+# zlib level for re-encoded PNGs. The PNG only lives for one response, so
+# level 1 (~3x faster than the default 6, ~15% larger) is the better trade.
+PNG_COMPRESS_LEVEL = 1
+
+
+def is_rgb8_png(image_bytes: bytes) -> bool:
+    """
+    Check whether bytes are a well-formed, non-interlaced 8-bit RGB PNG
+    holding nothing but pixel data.
+
+    Every chunk's CRC is checked and the file must end at IEND, but the
+    image data is not inflated. Files with other chunks (text, ICC
+    profiles, EXIF, ...) don't qualify, so they are re-encoded without them.
+
+    Args:
+        image_bytes: Raw image file bytes
+
+    Returns:
+        True if the image is already in the standardized PNG format
+    """
+    # Signature (8) + IHDR length/type (8) + width/height (8) + depth, color
+    # type, compression, filter and interlace method
+    if not (
+        len(image_bytes) > 28
+        and image_bytes[:8] == PNG_SIGNATURE
+        and image_bytes[12:16] == b"IHDR"
+        and image_bytes[24] == 8  # bit depth
+        and image_bytes[25] == 2  # color type: truecolor RGB
+        and image_bytes[28] == 0  # not interlaced
+    ):
+        return False
+
+    # Each chunk: length (4), type (4), data, CRC of type + data (4)
+    data = memoryview(image_bytes)
+    offset = len(PNG_SIGNATURE)
+    while offset + 12 <= len(data):
+        length, chunk_type = struct.unpack_from(">I4s", data, offset)
+        end = offset + 12 + length
+        if chunk_type not in PASSTHROUGH_PNG_CHUNKS or end > len(data):
+            return False
+        (crc,) = struct.unpack_from(">I", data, end - 4)
+        if zlib.crc32(data[offset + 4 : end - 4]) != crc:
+            return False
+        if chunk_type == b"IEND":
+            return end == len(data)
+        offset = end
+    return False
 
 
 def convert_image_to_base64(image_bytes: bytes) -> str:
@@ -320,6 +648,30 @@ def convert_image_to_base64(image_bytes: bytes) -> str:
     Returns:
         Base64-encoded PNG image string
     """
+    _, png_bytes = normalize_image(image_bytes)
+    return pybase64.b64encode_as_string(png_bytes)
+
+
+def normalize_image(image_bytes: bytes) -> tuple[Image.Image | bytes, bytes]:
+    """
+    Standardize uploaded image bytes to an RGB PNG.
+
+    Images that are already well-formed 8-bit RGB PNGs (see is_rgb8_png)
+    are returned as-is instead of being decoded and re-compressed. Their
+    output is the uploaded file, not re-standardized: its compression and
+    filtering are kept, and the pixel data is never decoded here.
+
+    Args:
+        image_bytes: Raw image file bytes
+
+    Returns:
+        Tuple of (image for OCR, PNG bytes). The OCR input is the decoded
+        RGB image when one was needed for re-encoding, otherwise the
+        original PNG bytes.
+    """
+    if is_rgb8_png(image_bytes):
+        return image_bytes, image_bytes
+
     # Open image and convert to RGB (standardize format)
     img = Image.open(BytesIO(image_bytes))
 
@@ -327,13 +679,31 @@ def convert_image_to_base64(image_bytes: bytes) -> str:
     if img.mode != "RGB":
         img = img.convert("RGB")
 
-    # Save as PNG to BytesIO
-    output = BytesIO()
-    img.save(output, format="PNG")
-    output.seek(0)
+    return img, encode_png(img)
+
+
+def encode_png(img: Image.Image) -> bytes:
+    """
+    Encode an RGB image as PNG bytes using OpenCV's libpng encoder.
+
+    cv2.imencode releases the GIL for the whole encode and is somewhat
+    faster than Pillow's PNG writer, so concurrent uploads encode in
+    parallel.
+
+    Args:
+        img: PIL image in RGB mode
 
-    # Encode to base64
-    return base64.b64encode(output.read()).decode("utf-8")
+    Returns:
+        PNG file bytes
+    """
+    # OpenCV expects BGR channel order
+    bgr = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2BGR)
+    ok, encoded = cv2.imencode(
+        ".png", bgr, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESS_LEVEL]
+    )
+    if not ok:
+        raise ValueError("Failed to encode image as PNG")
+    return encoded.tobytes()
 
 
 def count_issues(result: KTBFormResult) -> int:
@@ -346,12 +716,315 @@ def count_issues(result: KTBFormResult) -> int:
     Returns:
         Number of fields with status "needs-validation" or "error"
     """
-    count = 0
-    for category in result.form.categories:
-        for field in category.fields:
-            if field.status in (FieldStatus.NEEDS_VALIDATION, FieldStatus.ERROR):
-                count += 1
-    return count
+    confident = FieldStatus.CONFIDENT
+    return sum(
+        1
+        for category in result.form.categories
+        for field in category.fields
+        if field.status is not confident
+    )
+
+
+# csv.writer quotes a cell only if it contains one of these (our rows always
+# have several cells, so its lone-empty-cell rule never applies)
+CSV_QUOTED_CHARS = frozenset(',"\r\n')
+
+
+def is_plain_csv_cell(text: str) -> bool:
+    """Return True if csv.writer would write this cell unquoted, as-is."""
+    return CSV_QUOTED_CHARS.isdisjoint(text)
+
+
+@dataclass(slots=True)
+class PreparedUpload:
+    """An uploaded image that has been normalized but not yet OCR'd."""
+
+    uuid: str
+    image: str  # base64-encoded standardized PNG
+    cache_key: tuple[str, bytes]
+    ocr_image: Image.Image | bytes
+    form: KTBForm | None  # set from the form cache or after OCR
+
+
+def prepare_upload_file(file_data: FilePayload, schema: FormSchemaOutput) -> PreparedUpload:
+    """
+    Decode and normalize a single uploaded file.
+
+    Runs on UPLOAD_EXECUTOR so that images in one upload are prepared
+    concurrently.
+
+    Args:
+        file_data: Uploaded file with base64-encoded content
+        schema: Form schema defining expected categories and fields
+
+    Returns:
+        PreparedUpload for this file
+
+    Raises:
+        HTTPException: 400 if the file content is not valid base64
+    """
+    try:
+        # Decode the base64 string to get image bytes
+        content = pybase64.b64decode(file_data.base64, validate=True)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=400, detail=f"Invalid base64 string for file {file_data.name}"
+        )
+
+    return prepare_upload_content(file_data.uuid, content, schema)
+
+
+def prepare_upload_content(
+    uuid: str, content: bytes, schema: FormSchemaOutput
+) -> PreparedUpload:
+    """
+    Normalize the raw bytes of a single uploaded image.
+
+    Forms for recently seen images (same bytes, same schema version) are
+    taken from the form cache so the image can skip OCR.
+
+    Args:
+        uuid: Client-assigned identifier echoed back in the result
+        content: Raw image file bytes
+        schema: Form schema defining expected categories and fields
+
+    Returns:
+        PreparedUpload for this image
+    """
+    cache_key = (schema.updated_at, hashlib.blake2b(content, digest_size=16).digest())
+
+    # Convert to standardized PNG, keeping the decoded image for OCR
+    ocr_image, png_bytes = normalize_image(content)
+
+    return PreparedUpload(
+        uuid=uuid,
+        image=pybase64.b64encode_as_string(png_bytes),
+        cache_key=cache_key,
+        ocr_image=ocr_image,
+        form=get_cached_form(cache_key),
+    )
+
+
+def ocr_prepared_uploads(
+    uploads: list[PreparedUpload], schema: FormSchemaOutput, plan: SchemaPlan
+) -> None:
+    """
+    Fill in the form of each upload with a single batched OCR call.
+
+    Images that appear more than once are only OCR'd once. Images whose OCR
+    failed get an empty form that is not cached, so resubmitting them runs
+    OCR again.
+
+    Args:
+        uploads: Prepared uploads without a form
+        schema: Form schema defining expected categories and fields
+        plan: The same schema flattened by build_schema_plan()
+    """
+    unique: dict[tuple[str, bytes], PreparedUpload] = {}
+    for upload in uploads:
+        unique.setdefault(upload.cache_key, upload)
+
+    ocr_results = process_images([upload.ocr_image for upload in unique.values()], schema)
+
+    forms = {}
+    for key, ocr_result in zip(unique, ocr_results):
+        if ocr_result is None:
+            forms[key] = KTBForm.from_ocr_form(plan, OcrFormResult(categories={}))
+            continue
+        forms[key] = KTBForm.from_ocr_form(plan, ocr_result)
+        cache_form(key, forms[key])
+
+    for upload in uploads:
+        upload.form = forms[upload.cache_key]
+
+
+def get_cached_form(key: tuple[str, bytes]) -> KTBForm | None:
+    """Return the cached form for key, marking it most recently used."""
+    with FORM_CACHE_LOCK:
+        form = _form_cache.get(key)
+        if form is not None:
+            _form_cache.move_to_end(key)
+        return form
+
+
+def cache_form(key: tuple[str, bytes], form: KTBForm) -> None:
+    """Store a form in the cache, evicting the least recently used entry."""
+    with FORM_CACHE_LOCK:
+        _form_cache[key] = form
+        _form_cache.move_to_end(key)
+        if len(_form_cache) > FORM_CACHE_SIZE:
+            _form_cache.popitem(last=False)
+
+
+def check_upload_count(count: int) -> None:
+    """
+    Reject uploads with more images than the endpoint accepts.
+
+    Raises:
+        HTTPException: 400 if more than MAX_UPLOAD_IMAGES images are provided
+    """
+    if count > MAX_UPLOAD_IMAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Too many images. Maximum {MAX_UPLOAD_IMAGES} allowed, "
+                f"received {count}"
+            ),
+        )
+
+
+async def iter_upload_results(
+    prepare: Callable[..., PreparedUpload],
+    jobs: list[tuple],
+    return_exceptions: bool = False,
+) -> AsyncIterator[tuple[int, KTBFormResult | Exception]]:
+    """
+    Prepare each image on UPLOAD_EXECUTOR, OCR them in batches on
+    OCR_EXECUTOR and yield each result as soon as it is ready.
+
+    Images are sent to OCR in batches as they become ready, so preparing
+    later images overlaps OCR of earlier ones. Images found in the form cache
+    skip OCR and are yielded straight away.
+
+    Prepare and OCR work still outstanding when the iterator stops (on an
+    error, or when the caller closes it) is cancelled.
+
+    Args:
+        prepare: prepare_upload_file or prepare_upload_content
+        jobs: Leading positional arguments for each call to ``prepare``; the
+            current schema is appended
+        return_exceptions: Yield an image's exception in place of its result
+            instead of raising it, so the other images still finish
+
+    Yields:
+        (job index, result) pairs, in the order the results finish
+    """
+    # Get current schema (will create default if none exists)
+    current_schema = await asyncio.to_thread(get_schema)
+
+    # Decode and normalize images, one pool task per image
+    loop = asyncio.get_running_loop()
+    prepare_futures = [
+        loop.run_in_executor(UPLOAD_EXECUTOR, prepare, *job, current_schema)
+        for job in jobs
+    ]
+    schema_plan = build_schema_plan(current_schema)
+
+    order = {future: index for index, future in enumerate(prepare_futures)}
+    ocr_batches: dict[asyncio.Future, list[tuple[int, PreparedUpload]]] = {}
+
+    def submit_batch() -> None:
+        # Keep each batch in upload order, whatever order images finished in
+        batch.sort(key=itemgetter(0))
+        future = loop.run_in_executor(
+            OCR_EXECUTOR,
+            ocr_prepared_uploads,
+            [upload for _, upload in batch],
+            current_schema,
+            schema_plan,
+        )
+        ocr_batches[future] = batch[:]
+        pending.add(future)
+        batch.clear()
+
+    def finished(upload: PreparedUpload) -> KTBFormResult:
+        return KTBFormResult.model_construct(
+            uuid=upload.uuid, image=upload.image, form=upload.form
+        )
+
+    batch: list[tuple[int, PreparedUpload]] = []
+    batch_deadline = 0.0
+    preparing = len(prepare_futures)
+    pending: set[asyncio.Future] = set(prepare_futures)
+    try:
+        while pending:
+            timeout = max(batch_deadline - loop.time(), 0) if batch else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in sorted(done, key=lambda future: order.get(future, -1)):
+                if future in ocr_batches:
+                    # An OCR batch finished
+                    ocr_batch = ocr_batches.pop(future)
+                    try:
+                        future.result()
+                    except Exception as error:
+                        if not return_exceptions:
+                            raise
+                        for index, _ in ocr_batch:
+                            yield index, error
+                        continue
+                    for index, upload in ocr_batch:
+                        yield index, finished(upload)
+                    continue
+
+                preparing -= 1
+                try:
+                    upload = future.result()
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    yield order[future], error
+                    continue
+                # Images found in the form cache skip OCR
+                if upload.form is not None:
+                    yield order[future], finished(upload)
+                    continue
+
+                if not batch:
+                    batch_deadline = loop.time() + OCR_BATCH_WAIT
+                batch.append((order[future], upload))
+                if len(batch) >= OCR_BATCH_SIZE:
+                    submit_batch()
+
+            if batch and (not preparing or loop.time() >= batch_deadline):
+                submit_batch()
+    finally:
+        # Nobody is waiting on these any more; drop the ones not yet started
+        for future in pending:
+            future.cancel()
+
+
+def upload_error(uuid: str, error: Exception) -> UploadError:
+    """
+    Describe why one image of a streamed upload failed.
+
+    Client errors keep their detail; anything else is logged and reported
+    generically.
+    """
+    if isinstance(error, HTTPException):
+        return UploadError(uuid=uuid, error=str(error.detail))
+    logger.error("Error processing upload %s", uuid, exc_info=error)
+    return UploadError(uuid=uuid, error="Could not process image")
+
+
+async def build_upload_response(
+    prepare: Callable[..., PreparedUpload], jobs: list[tuple]
+) -> UploadResponse:
+    """
+    Process every image in an upload and rank the results.
+
+    Args:
+        prepare: prepare_upload_file or prepare_upload_content
+        jobs: Leading positional arguments for each call to ``prepare``; the
+            current schema is appended
+
+    Returns:
+        Processed results sorted by number of issues (most issues first)
+    """
+    form_results: list[KTBFormResult | None] = [None] * len(jobs)
+    async for index, result in iter_upload_results(prepare, jobs):
+        form_results[index] = result
+
+    # Sort by number of issues (descending - most issues first), counting
+    # each result once up front
+    ranked = sorted(
+        ((count_issues(result), result) for result in form_results),
+        key=itemgetter(0),
+        reverse=True,
+    )
+
+    return UploadResponse(results=[result for _, result in ranked])
 
 
 # =============================================================================
@@ -381,7 +1054,8 @@ async def get_form_schema():
     Returns:
         Current form schema with categories, fields, and last update timestamp
     """
-    return get_schema()
+    # File I/O runs off the event loop
+    return await asyncio.to_thread(get_schema)
 
 
 @app.put("/form-schema", response_model=FormSchemaOutput)
@@ -398,16 +1072,26 @@ async def update_form_schema(schema: FormSchemaInput):
     Returns:
         Updated schema with new timestamp
     """
-    return save_schema(schema)
+    # File I/O runs off the event loop
+    return await asyncio.to_thread(save_schema, schema)
 
 
-@app.post("/upload", response_model=UploadResponse)
-async def upload_images(payload: UploadPayload):
+@app.post(
+    "/upload",
+    response_model=UploadResponse,
+    deprecated=True,
+    openapi_extra=request_body_openapi(UPLOAD_PAYLOAD_ADAPTER),
+)
+async def upload_images(request: Request):
     """
     Upload and process images for OCR form extraction from a JSON payload.
 
+    Deprecated in favor of /upload-multipart, which takes the raw image bytes
+    instead of base64 text (about a third smaller, with no decode pass).
+
     Args:
-        payload: JSON body containing a list of base64-encoded files and metadata.
+        request: Request whose JSON body is an UploadPayload, a list of
+            base64-encoded files and metadata.
 
     Returns:
         Processed results sorted by number of issues (most issues first)
@@ -415,47 +1099,128 @@ async def upload_images(payload: UploadPayload):
     Raises:
         HTTPException: 400 if validation fails or more than 100 images provided
     """
+    payload: UploadPayload = await parse_request_body(request, UPLOAD_PAYLOAD_ADAPTER)
+
+    # Validate image count
+    check_upload_count(len(payload.files))
+
+    return await build_upload_response(
+        prepare_upload_file, [(file_data,) for file_data in payload.files]
+    )
+
+
+async def read_multipart_jobs(
+    files: list[UploadFile], metadata: str
+) -> list[tuple[str, bytes]]:
+    """
+    Validate a multipart upload and pair each file's bytes with its uuid.
+
+    Args:
+        files: Image files, sent as raw bytes
+        metadata: JSON list of UploadMetadata objects, one per file in the
+            same order
+
+    Returns:
+        (uuid, file bytes) for each file, for prepare_upload_content
+
+    Raises:
+        HTTPException: 400 if more than 100 images are provided, or if the
+            metadata is invalid or does not match the number of files
+    """
     # Validate image count
-    if len(payload.files) > 100:
+    check_upload_count(len(files))
+
+    try:
+        file_metadata = UPLOAD_METADATA_ADAPTER.validate_json(metadata)
+    except ValidationError:
+        raise HTTPException(status_code=400, detail="Invalid metadata JSON")
+
+    if len(file_metadata) != len(files):
         raise HTTPException(
             status_code=400,
-            detail=f"Too many images. Maximum 100 allowed, received {len(payload.files)}",
+            detail=(
+                f"Metadata count ({len(file_metadata)}) must match "
+                f"file count ({len(files)})"
+            ),
         )
 
-    # Get current schema (will create default if none exists)
-    current_schema = get_schema()
-
-    # Process images with OCR
-    form_results = []
-    for file_data in payload.files:
-        try:
-            # Decode the base64 string to get image bytes
-            content = base64.b64decode(file_data.base64)
-        except (ValueError, TypeError):
-            raise HTTPException(
-                status_code=400, detail=f"Invalid base64 string for file {file_data.name}"
-            )
+    return [
+        (meta.uuid, await upload.read())
+        for meta, upload in zip(file_metadata, files)
+    ]
 
-        # Convert to standardized base64 PNG
-        b64_image = convert_image_to_base64(content)
 
-        # Process with OCR
-        ocr_result = process_image(b64_image, current_schema)
+@app.post("/upload-multipart", response_model=UploadResponse)
+async def upload_images_multipart(
+    files: list[UploadFile] = File(...),
+    metadata: str = Form(...),
+):
+    """
+    Upload and process images for OCR form extraction as multipart form data.
 
-        # Create form result
-        form = KTBForm.from_ocr_form(current_schema, ocr_result)
-        form_results.append(
-            KTBFormResult(uuid=file_data.uuid, image=b64_image, form=form)
-        )
+    Args:
+        files: Image files, sent as raw bytes
+        metadata: JSON list of UploadMetadata objects, one per file in the
+            same order; each uuid is echoed back in its result
+
+    Returns:
+        Processed results sorted by number of issues (most issues first)
+
+    Raises:
+        HTTPException: 400 if more than 100 images are provided, or if the
+            metadata is invalid or does not match the number of files
+    """
+    jobs = await read_multipart_jobs(files, metadata)
+    return await build_upload_response(prepare_upload_content, jobs)
 
-    # Sort by number of issues (descending - most issues first)
-    form_results.sort(key=count_issues, reverse=True)
 
-    return UploadResponse(results=form_results)
+@app.post(
+    "/upload-multipart/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def upload_images_multipart_stream(
+    files: list[UploadFile] = File(...),
+    metadata: str = Form(...),
+):
+    """
+    Upload and process images like /upload-multipart, streaming each result
+    as soon as its image is done.
+
+    The response is newline-delimited JSON: one KTBFormResult per line, in
+    the order images finish rather than sorted by issues, so clients can
+    show results while later images are still being processed. An image
+    that can't be processed gets an UploadError line instead, so every
+    uuid gets exactly one line.
+
+    Args:
+        files: Image files, sent as raw bytes
+        metadata: JSON list of UploadMetadata objects, one per file in the
+            same order; each uuid is echoed back in its result
 
+    Returns:
+        StreamingResponse of NDJSON-encoded KTBFormResult or UploadError lines
 
-@app.post("/generate-csv")
-async def generate_csv(request: CsvGenerationRequest):
+    Raises:
+        HTTPException: 400 if more than 100 images are provided, or if the
+            metadata is invalid or does not match the number of files
+    """
+    jobs = await read_multipart_jobs(files, metadata)
+
+    async def result_stream():
+        results = iter_upload_results(prepare_upload_content, jobs, return_exceptions=True)
+        async with aclosing(results):
+            async for index, result in results:
+                if isinstance(result, Exception):
+                    yield UPLOAD_ERROR_ADAPTER.dump_json(upload_error(jobs[index][0], result)) + b"\n"
+                else:
+                    yield UPLOAD_RESULT_ADAPTER.dump_json(result) + b"\n"
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+
+@app.post("/generate-csv", openapi_extra=request_body_openapi(CSV_REQUEST_ADAPTER))
+async def generate_csv(raw_request: Request):
     """
     Generate a CSV file from corrected form data and metadata.
 
@@ -463,7 +1228,8 @@ async def generate_csv(request: CsvGenerationRequest):
     and all metadata fields duplicated across all rows.
 
     Args:
-        request: CSV generation request with metadata and cleanup data
+        raw_request: Request whose JSON body is a CsvGenerationRequest with
+            metadata and cleanup data
 
     Returns:
         StreamingResponse with CSV file content
@@ -480,33 +1246,46 @@ async def generate_csv(request: CsvGenerationRequest):
         the CSV will have columns: field_name, value, category_name, date
         and one row: bottles, 5, Plastics, 2024-01-01
     """
-    # Build CSV in memory
-    output = StringIO()
+    request: CsvGenerationRequest = await parse_request_body(
+        raw_request, CSV_REQUEST_ADAPTER
+    )
 
-    # Create metadata column names and values dict
-    metadata_columns = [field.name for field in request.metadata]
-    metadata_values = {field.name: field.value for field in request.metadata}
+    # Metadata column names and values, in request order, shared by every row
+    metadata_columns = tuple(field.name for field in request.metadata)
+    metadata_values = tuple(field.value for field in request.metadata)
 
     # Define CSV columns: field_name, value, category_name, then all metadata columns
-    fieldnames = ["field_name", "value", "category_name"] + metadata_columns
-
-    writer = csv.DictWriter(output, fieldnames=fieldnames, lineterminator='\n')
-    writer.writeheader()
-
-    # Write a row for each field in each category
-    for category in request.cleanup_data:
-        for field in category.fields:
-            row = {
-                "field_name": field.name,
-                "value": field.value,
-                "category_name": category.category,
-                **metadata_values  # Spread all metadata values
-            }
-            writer.writerow(row)
-
-    # Prepare CSV content for streaming
-    output.seek(0)
-    csv_content = output.getvalue()
+    fieldnames = ("field_name", "value", "category_name", *metadata_columns)
+
+    async def row_stream():
+        """Yield the header, then one CSV chunk per category."""
+        # Small buffer reused for every chunk instead of holding the whole file
+        buffer = StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(fieldnames)
+        yield buffer.getvalue()
+
+        # Rows whose text cells need no quoting are formatted directly, which
+        # is much cheaper than csv.writer; the rest still go through it. The
+        # metadata part is the same for every row, so it is formatted once.
+        metadata_plain = all(is_plain_csv_cell(value) for value in metadata_values)
+        metadata_suffix = "".join("," + value for value in metadata_values) + "\n"
+
+        # Write a row for each field in each category
+        for category in request.cleanup_data:
+            buffer.seek(0)
+            buffer.truncate()
+            category_name = category.category
+            plain_tail = metadata_plain and is_plain_csv_cell(category_name)
+            tail = f",{category_name}{metadata_suffix}"
+            for field in category.fields:
+                if plain_tail and is_plain_csv_cell(field.name):
+                    buffer.write(f"{field.name},{field.value}{tail}")
+                else:
+                    writer.writerow(
+                        (field.name, field.value, category_name, *metadata_values)
+                    )
+            yield buffer.getvalue()
 
     # Generate filename with timestamp
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -514,7 +1293,7 @@ async def generate_csv(request: CsvGenerationRequest):
 
     # Return as streaming response with appropriate headers
     return StreamingResponse(
-        iter([csv_content]),
+        row_stream(),
         media_type="text/csv",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
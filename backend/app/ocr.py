@@ -6,14 +6,19 @@ card count data from data collection form images.
 """
 
 import logging
-from pathlib import Path
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from queue import Queue
 import re
-import tempfile
-from typing import Any, Optional
+from threading import Lock
+from typing import Any, Iterator, Optional
 
+import cv2
+import numpy as np
 from paddleocr import PaddleOCR
 from PIL import Image
-from pydantic import BaseModel
 
 from utils.preprocessor import ImagePreprocessor
 
@@ -31,26 +36,138 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
-class OcrFieldResult(BaseModel):
+# These are internal results (never request data), so they are plain
+# dataclasses rather than validated Pydantic models.
+
+
+@dataclass(slots=True, frozen=True)
+class OcrFieldResult:
     """Raw OCR result for a single field (before validation)."""
 
     value: Optional[Any]
     confidence: Optional[float]
 
 
-class OcrCategoryResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class OcrCategoryResult:
     """Raw OCR results for a category."""
 
     name: str
     fields: dict[str, OcrFieldResult]  # field_name -> result
 
 
-class OcrFormResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class OcrFormResult:
     """Raw OCR results for an entire form."""
 
     categories: dict[str, OcrCategoryResult]  # category_name -> result
 
 
+# A count written next to a label, e.g. "=5" or "= 12"
+COUNT_PATTERN = re.compile(r'=\s*(\d+)')
+
+
+@dataclass(slots=True, frozen=True)
+class OcrFragment:
+    """An OCR text fragment with the normalized forms field matching reads."""
+
+    text: str
+    text_lower: str
+    x: float
+    y: float
+    confidence: float
+    count_match: Optional[re.Match[str]]  # COUNT_PATTERN match in text
+
+
+@dataclass(slots=True, frozen=True)
+class CardIndex:
+    """
+    One card's OCR fragments laid out for field matching.
+
+    Positions are kept as parallel NumPy arrays so the spatial checks for
+    each field are vector masks rather than loops over fragments.
+    """
+
+    fragments: list[OcrFragment]  # sorted by position (y, then x)
+    probe_hits: dict[str, np.ndarray]  # key word probe -> contained, per fragment
+    # Fragments containing =NUMBER
+    count_xs: np.ndarray
+    count_ys: np.ndarray
+    count_values: list[int]
+    count_confidences: list[float]
+    # Fragments containing the label of a schema item
+    label_xs: np.ndarray
+    label_ys: np.ndarray
+    label_names: list[frozenset[str]]  # items whose label each one contains
+
+
+@dataclass(slots=True, frozen=True)
+class SchemaLayout:
+    """A form schema flattened into the lookups field matching reads."""
+
+    category_names: tuple[str, ...]
+    fields: tuple[tuple[str, str], ...]  # (field_name, category_name), in schema order
+    key_words: dict[str, tuple[str, ...]]  # field_name -> key words
+    words: frozenset[str]  # every key word of every field
+    probes: frozenset[str]  # every key word probe of every field
+
+
+def _key_words(item_name: str) -> tuple[str, ...]:
+    """The words of an item name used for matching (longer words are more distinctive)."""
+    item_words = item_name.lower().split()
+    key_words = [w for w in item_words if len(w) > 3]
+    return tuple(key_words or item_words)
+
+
+def _key_word_probe(word: str) -> str:
+    """
+    The part of a key word a fragment must contain for the word to match.
+
+    A fragment containing the whole word also contains its first four
+    letters, so the exact-or-prefix match reduces to the prefix.
+    """
+    return word[:4] if len(word) >= 4 else word
+
+
+def get_schema_layout(schema: "FormSchemaOutput") -> SchemaLayout:
+    """Get the SchemaLayout for a schema, building it only for new schemas."""
+    return _build_schema_layout(
+        tuple(
+            (category.name, tuple(field.name for field in category.fields))
+            for category in schema.categories
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_schema_layout(
+    categories: tuple[tuple[str, tuple[str, ...]], ...]
+) -> SchemaLayout:
+    """Flatten (category name, field names) pairs into a SchemaLayout."""
+    # Build a flat list of all field names for cross-checking
+    all_field_names = []
+    field_to_category = {}
+
+    for category_name, field_names in categories:
+        for field_name in field_names:
+            all_field_names.append(field_name)
+            field_to_category[field_name] = category_name
+
+    key_words = {field_name: _key_words(field_name) for field_name in field_to_category}
+
+    return SchemaLayout(
+        category_names=tuple(category_name for category_name, _ in categories),
+        fields=tuple(
+            (field_name, field_to_category[field_name]) for field_name in all_field_names
+        ),
+        key_words=key_words,
+        words=frozenset(word for words in key_words.values() for word in words),
+        probes=frozenset(
+            _key_word_probe(word) for words in key_words.values() for word in words
+        ),
+    )
+
+
 # =============================================================================
 # DataCardOCR Class
 # =============================================================================
@@ -65,21 +182,42 @@ class DataCardOCR:
     the text to extract field counts using pattern matching.
     """
     
-    def __init__(self, enhance_contrast: bool = False, denoise: bool = False):
+    def __init__(
+        self,
+        enhance_contrast: bool = False,
+        denoise: bool = False,
+        cpu_threads: Optional[int] = None
+    ):
         """
         Initialize PaddleOCR with optimized settings for data cards.
         
         Args:
             enhance_contrast: Whether to enhance image contrast during preprocessing
             denoise: Whether to apply denoising during preprocessing
+            cpu_threads: Threads for one CPU inference (Paddle's default if None)
         """
+        # We ship the CPU build of Paddle: run inference through oneDNN
+        # (MKL-DNN) kernels, which work on any x86 CPU
+        inference_options = {'enable_mkldnn': True}
+        if cpu_threads is not None:
+            inference_options['cpu_threads'] = cpu_threads
+        
         self.ocr = PaddleOCR(
             lang='en',
             use_doc_orientation_classify=False,
             use_doc_unwarping=False,
-            use_textline_orientation=False
+            use_textline_orientation=False,
+            # Recognize text lines in larger batches; with batched OCR calls
+            # these fill up across images
+            text_recognition_batch_size=16,
+            **inference_options
         )
         
+        # Paddle predictors are not thread-safe; serialize inference only, so
+        # that preprocessing and field extraction for other images can run
+        # alongside it
+        self._predict_lock = Lock()
+        
         # Initialize image preprocessor with minimal processing
         # PaddleOCR works better with less aggressive preprocessing
         self.preprocessor = ImagePreprocessor(
@@ -98,60 +236,102 @@ class DataCardOCR:
         Returns:
             Dictionary containing OCR results with text, coordinates, and confidence
         """
+        return self.process_images_ocr([image])[0]
+    
+    def process_images_ocr(self, images: list[Image.Image]) -> list[dict[str, Any]]:
+        """
+        Run OCR on several images with a single PaddleOCR call.
+        
+        Batching lets PaddleOCR fill its recognition batches across images
+        instead of paying the per-call overhead once per image.
+        
+        Args:
+            images: PIL Images to process
+            
+        Returns:
+            One OCR result dictionary per image, in input order (same shape
+            as process_image_ocr)
+        """
+        arrays = [self._prepare_ocr_input(image) for image in images]
+        
+        # predict_iter yields one result per input image, in order
+        batch_results = []
+        for res in self._predict(arrays):
+            ocr_results = self._extract_ocr_items(res)
+            batch_results.append({
+                'ocr_results': ocr_results,
+                'text_lines': [item['text'] for item in ocr_results]
+            })
+        
+        return batch_results
+    
+    def _predict(self, arrays: list[np.ndarray]) -> list[Any]:
+        """Run PaddleOCR on prepared image arrays, one result per array."""
+        if not arrays:
+            return []
+        
+        # Run OCR using predict_iter (same as working implementation)
+        with self._predict_lock:
+            return list(self.ocr.predict_iter(arrays))
+    
+    def _prepare_ocr_input(self, image: Image.Image) -> np.ndarray:
+        """
+        Resize an image and convert it to the array layout PaddleOCR reads.
+        
+        Args:
+            image: PIL Image to process
+            
+        Returns:
+            uint8 HWC array in BGR channel order
+        """
         # Always resize to max size - this is required for PaddleOCR
         image = self.preprocessor.resize_image_if_needed(image, max_size=1296)
         
-        # Save to temporary file for PaddleOCR
-        with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-            image.save(tmp_path, format='JPEG', quality=95)
+        # Hand PaddleOCR the pixels directly instead of a temp JPEG file.
+        # Array inputs are read as BGR, the same layout cv2.imread gave it.
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2BGR)
+    
+    def _extract_ocr_items(self, res: Any) -> list[dict[str, Any]]:
+        """
+        Extract text, confidence, and box for each line in a PaddleOCR result.
         
-        try:
-            # Run OCR using predict_iter (same as working implementation)
-            result_iter = self.ocr.predict_iter(tmp_path)
-            
-            # Process results from iterator
-            ocr_results = []
+        Args:
+            res: One result object yielded by predict_iter
             
-            idx = 0
-            for res in result_iter:
-                idx += 1
-                
-                # Extract data from result object (same as working implementation)
-                result_data = None
-                if hasattr(res, 'json') and isinstance(res.json, dict):
-                    result_data = res.json
-                elif hasattr(res, 'json') and callable(res.json):
-                    result_data = res.json()
-                elif hasattr(res, 'to_dict'):
-                    result_data = res.to_dict()
-                elif hasattr(res, '__dict__'):
-                    result_data = {k: str(v) for k, v in res.__dict__.items() if not k.startswith('_')}
-                else:
-                    continue
-                
-                # Extract text, boxes, and scores from the result
-                if 'res' in result_data:
-                    res_data = result_data['res']
-                    texts = res_data.get('rec_texts', [])
-                    scores = res_data.get('rec_scores', [])
-                    boxes = res_data.get('rec_boxes', [])
-                    
-                    for i, (text, score, box) in enumerate(zip(texts, scores, boxes)):
-                        ocr_results.append({
-                            'text': text,
-                            'confidence': score,
-                            'box': box  # [x_min, y_min, x_max, y_max]
-                        })
+        Returns:
+            List of dicts with 'text', 'confidence', and 'box' keys
+        """
+        # Extract data from result object (same as working implementation)
+        result_data = None
+        if hasattr(res, 'json') and isinstance(res.json, dict):
+            result_data = res.json
+        elif hasattr(res, 'json') and callable(res.json):
+            result_data = res.json()
+        elif hasattr(res, 'to_dict'):
+            result_data = res.to_dict()
+        elif hasattr(res, '__dict__'):
+            result_data = {k: str(v) for k, v in res.__dict__.items() if not k.startswith('_')}
+        else:
+            return []
+        
+        # Extract text, boxes, and scores from the result
+        ocr_items = []
+        if 'res' in result_data:
+            res_data = result_data['res']
+            texts = res_data.get('rec_texts', [])
+            scores = res_data.get('rec_scores', [])
+            boxes = res_data.get('rec_boxes', [])
             
-            return {
-                'ocr_results': ocr_results,
-                'text_lines': [item['text'] for item in ocr_results]
-            }
+            for text, score, box in zip(texts, scores, boxes):
+                ocr_items.append({
+                    'text': text,
+                    'confidence': score,
+                    'box': box  # [x_min, y_min, x_max, y_max]
+                })
         
-        finally:
-            # Clean up temporary file
-            Path(tmp_path).unlink(missing_ok=True)
+        return ocr_items
     
     def extract_field_counts(
         self, 
@@ -171,32 +351,26 @@ class DataCardOCR:
         Returns:
             Dictionary mapping category names to field results
         """
-        # Build a flat list of all field names for cross-checking
-        all_field_names = []
-        field_to_category = {}
+        # Flattened schema (cached across cards with the same schema)
+        layout = get_schema_layout(schema)
         
-        for category in schema.categories:
-            for field in category.fields:
-                all_field_names.append(field.name)
-                field_to_category[field.name] = category.name
-        
-        # Sort OCR results by position (y, then x) for spatial analysis
-        sorted_results = sorted(ocr_results, key=lambda x: (x['box'][1], x['box'][0]))
+        # Normalize and index the fragments once rather than once per schema item
+        card = self._index_card(ocr_results, layout)
         
         # Initialize all categories in the result structure
-        category_results = {}
-        for category in schema.categories:
-            category_results[category.name] = {}
-        
-        # Extract counts for each field
-        for field_name in all_field_names:
-            count, confidence = self._find_item_count(
-                field_name, 
-                sorted_results, 
-                all_field_names
-            )
-            
-            category_name = field_to_category[field_name]
+        category_results = {category_name: {} for category_name in layout.category_names}
+        
+        # Extract counts for each field. A name used in several categories
+        # (e.g. "Other") finds the same count each time, so look it up once.
+        found: dict[str, tuple[int, float]] = {}
+        for field_name, category_name in layout.fields:
+            if field_name not in found:
+                found[field_name] = self._find_item_count(
+                    field_name, 
+                    layout.key_words[field_name],
+                    card
+                )
+            count, confidence = found[field_name]
             
             # Always store the field, even if not found (with None values)
             if count > 0 or confidence > 0:
@@ -213,11 +387,83 @@ class DataCardOCR:
         
         return category_results
     
+    def _index_card(
+        self,
+        ocr_results: list[dict[str, Any]],
+        layout: SchemaLayout
+    ) -> CardIndex:
+        """
+        Normalize a card's OCR results and index them for field matching.
+        
+        Besides each fragment's lowercased text and =NUMBER match, this finds
+        which fragments contain each key word, where the counts are, and
+        which fragments contain the label of a schema item (at least 70% of
+        its key words). Those labels stop a count from being attributed to
+        an item further left on the same line.
+        
+        Args:
+            ocr_results: List of OCR results with text, confidence, and coordinates
+            layout: The flattened schema
+        
+        Returns:
+            CardIndex for the card
+        """
+        # Sort OCR results by position (y, then x) for spatial analysis
+        sorted_results = sorted(ocr_results, key=lambda x: (x['box'][1], x['box'][0]))
+        
+        fragments = [
+            OcrFragment(
+                text=item['text'],
+                text_lower=item['text'].lower(),
+                x=item['box'][0],
+                y=item['box'][1],
+                confidence=item['confidence'],
+                count_match=COUNT_PATTERN.search(item['text'])
+            )
+            for item in sorted_results
+        ]
+        count_fragments = [fragment for fragment in fragments if fragment.count_match]
+        
+        # Which fragments contain each whole key word, then for each item
+        # which fragments contain at least 70% of its key words
+        word_hits = {
+            word: np.array([word in fragment.text_lower for fragment in fragments], dtype=bool)
+            for word in layout.words
+        }
+        label_items = [item_name for item_name, words in layout.key_words.items() if words]
+        labels = []
+        if label_items and fragments:
+            is_label = np.array([
+                np.sum([word_hits[word] for word in layout.key_words[item_name]], axis=0)
+                / len(layout.key_words[item_name]) >= 0.7
+                for item_name in label_items
+            ])
+            for index in np.flatnonzero(is_label.any(axis=0)):
+                names = frozenset(label_items[i] for i in np.flatnonzero(is_label[:, index]))
+                labels.append((fragments[index], names))
+        
+        return CardIndex(
+            fragments=fragments,
+            # One boolean row per key word (or its 4-letter prefix), so
+            # matching an item reads a few rows instead of every fragment
+            probe_hits={
+                probe: np.array([probe in fragment.text_lower for fragment in fragments], dtype=bool)
+                for probe in layout.probes
+            },
+            count_xs=np.array([fragment.x for fragment in count_fragments], dtype=np.float64),
+            count_ys=np.array([fragment.y for fragment in count_fragments], dtype=np.float64),
+            count_values=[int(fragment.count_match.group(1)) for fragment in count_fragments],
+            count_confidences=[fragment.confidence for fragment in count_fragments],
+            label_xs=np.array([fragment.x for fragment, _ in labels], dtype=np.float64),
+            label_ys=np.array([fragment.y for fragment, _ in labels], dtype=np.float64),
+            label_names=[names for _, names in labels],
+        )
+    
     def _find_item_count(
         self,
         item_name: str,
-        ocr_items: list[dict[str, Any]],
-        all_items: list[str]
+        key_words: tuple[str, ...],
+        card: CardIndex
     ) -> tuple[int, float]:
         """
         Find the count for a specific item using schema-driven spatial matching.
@@ -230,45 +476,44 @@ class DataCardOCR:
         
         Args:
             item_name: The item to search for (e.g., "Cigarette butts")
-            ocr_items: List of OCR result dicts with text, confidence, and box coordinates
-            all_items: All schema items (to avoid matching counts from other items)
+            key_words: The item's key words, from its SchemaLayout
+            card: The card's indexed OCR fragments, from _index_card
         
         Returns:
             Tuple of (count, confidence)
         """
-        # Normalize item name for fuzzy matching
-        item_lower = item_name.lower()
-        item_words = item_lower.split()
-        
-        # Get key words (longer words are more distinctive)
-        key_words = [w for w in item_words if len(w) > 3]
         if not key_words:
-            key_words = item_words
+            return 0, 0.0
         
-        # Find OCR fragments that match this schema item
+        # Count how many key words match each fragment (fuzzy - exact match or
+        # prefix match, to allow OCR errors)
+        match_counts = np.sum(
+            [card.probe_hits[_key_word_probe(word)] for word in key_words], axis=0
+        )
+        
+        # Find OCR fragments that match this schema item. Fragments matching
+        # no key word can't reach the threshold, so only matches are scored.
         item_matches = []
-        for item in ocr_items:
-            text = item['text']
-            text_lower = text.lower()
-            x, y = item['box'][0], item['box'][1]
-            conf = item['confidence']
+        for index in np.flatnonzero(match_counts):
+            fragment = card.fragments[index]
+            text_lower = fragment.text_lower
             
-            # Count how many key words match (fuzzy - allow OCR errors)
-            match_count = 0
-            for word in key_words:
-                # Exact match or prefix match (for OCR errors)
-                if word in text_lower or (len(word) >= 4 and text_lower.find(word[:4]) >= 0):
-                    match_count += 1
-            
-            match_quality = match_count / len(key_words) if key_words else 0
+            match_quality = int(match_counts[index]) / len(key_words)
             
             # Check if words appear in correct order (bonus for correct ordering)
             in_order = True
             last_pos = -1
             for word in key_words:
-                pos = text_lower.find(word)
-                if pos < 0 and len(word) >= 4:
-                    pos = text_lower.find(word[:4])
+                # Position of the word, else of its prefix. Every occurrence
+                # of the word is also one of its probe, so search for the probe
+                # first: the word is only looked for past it, and not at all
+                # when the probe is missing.
+                probe = _key_word_probe(word)
+                pos = text_lower.find(probe)
+                if pos >= 0 and len(word) > 4:
+                    word_pos = text_lower.find(word, pos)
+                    if word_pos >= 0:
+                        pos = word_pos
                 if pos >= 0:
                     if pos <= last_pos:
                         in_order = False
@@ -276,27 +521,28 @@ class DataCardOCR:
                     last_pos = pos
             
             # Boost match quality if words are in correct order
-            if in_order and match_quality > 0:
+            if in_order:
                 match_quality += 0.5
             
             # More lenient matching: at least 50% of key words
             if match_quality >= 0.5:
-                item_matches.append((text, x, y, conf, match_quality))
+                item_matches.append((fragment, match_quality))
         
         if not item_matches:
             return 0, 0.0
         
         # Sort by match quality (best first)
-        item_matches.sort(key=lambda m: m[4], reverse=True)
+        item_matches.sort(key=lambda m: m[1], reverse=True)
         
         # For the best match, check if the count is IN THE SAME OCR fragment
-        item_text, item_x, item_y, item_conf, match_quality = item_matches[0]
+        best_fragment = item_matches[0][0]
+        item_x, item_y, item_conf = best_fragment.x, best_fragment.y, best_fragment.confidence
         
         # FIRST: Check if the item text itself contains =NUMBER (combined in same OCR block)
-        embedded_match = re.search(r'=\s*(\d+)', item_text)
+        embedded_match = best_fragment.count_match
         if embedded_match:
             # Verify the =NUMBER appears after the item name keywords in the text
-            item_text_lower = item_text.lower()
+            item_text_lower = best_fragment.text_lower
             last_keyword_pos = -1
             for word in key_words:
                 pos = item_text_lower.rfind(word)
@@ -309,93 +555,105 @@ class DataCardOCR:
                 count = int(embedded_match.group(1))
                 return count, item_conf
         
-        # SECOND: Find =NUMBER patterns on the same line to the right
-        best_count = None
-        best_confidence = None
-        best_distance = float('inf')
+        # SECOND: Find =NUMBER patterns on the same line to the right.
+        # Must be on the SAME LINE:
+        # - To the right (dx > 0)
+        # - Within 18 pixels vertically (tight tolerance)
+        # - Within 400 pixels horizontally
+        dx = card.count_xs - item_x
+        candidates = np.flatnonzero((dx > 0) & (dx < 400) & (np.abs(card.count_ys - item_y) < 18))
         
-        for item in ocr_items:
-            text = item['text']
-            x, y = item['box'][0], item['box'][1]
-            conf = item['confidence']
+        if candidates.size:
+            # Take the nearest count. If another schema item sits between it
+            # and this item, that item also sits in front of every count
+            # further right, so the nearest count is the only one to check.
+            nearest = candidates[np.argmin(dx[candidates])]
+            x = card.count_xs[nearest]
             
-            match = re.search(r'=\s*(\d+)', text)
-            if match:
-                count = int(match.group(1))
-                
-                # Calculate spatial distance
-                dx = x - item_x
-                dy = abs(y - item_y)
-                
-                # Must be on the SAME LINE:
-                # - To the right (dx > 0)
-                # - Within 18 pixels vertically (tight tolerance)
-                # - Within 400 pixels horizontally
-                if dx > 0 and dx < 400 and dy < 18:
-                    # Check if there's another schema item between this item and the count
-                    blocked = False
-                    for other_item in all_items:
-                        if other_item == item_name:
-                            continue
-                        
-                        other_lower = other_item.lower()
-                        other_words = [w for w in other_lower.split() if len(w) > 3]
-                        if not other_words:
-                            other_words = other_lower.split()
-                        
-                        for check_item in ocr_items:
-                            check_text_lower = check_item['text'].lower()
-                            check_x = check_item['box'][0]
-                            check_y = check_item['box'][1]
-                            
-                            other_match_count = sum(1 for word in other_words if word in check_text_lower)
-                            other_match_quality = other_match_count / len(other_words) if other_words else 0
-                            
-                            if other_match_quality >= 0.7:
-                                # This other item is present - is it between our item and count?
-                                if item_x + 30 < check_x < x - 30 and abs(check_y - item_y) < 15:
-                                    blocked = True
-                                    break
-                        
-                        if blocked:
-                            break
-                    
-                    if not blocked:
-                        distance = dx
-                        
-                        if distance < best_distance:
-                            best_distance = distance
-                            best_count = count
-                            best_confidence = conf
-        
-        if best_count is not None:
-            return best_count, best_confidence
+            # Check if there's another schema item between this item and the count
+            between = np.flatnonzero(
+                (card.label_xs > item_x + 30)
+                & (card.label_xs < x - 30)
+                & (np.abs(card.label_ys - item_y) < 15)
+            )
+            blocked = any(
+                len(card.label_names[index]) > 1 or item_name not in card.label_names[index]
+                for index in between
+            )
+            
+            if not blocked:
+                return card.count_values[nearest], card.count_confidences[nearest]
         
         # Not found - return 0 with confidence 0.0
         return 0, 0.0
     
     def process_image_to_form_result(
         self, 
-        image: Image.Image | str,
+        image: Image.Image | bytes | str,
         schema: "FormSchemaOutput"
     ) -> OcrFormResult:
         """
         Process an image and extract form data based on schema.
         
         Args:
-            image: PIL Image or base64-encoded image string
+            image: PIL Image, encoded image file bytes, or base64-encoded
+                image string
             schema: Form schema defining expected categories and fields
             
         Returns:
             OcrFormResult with extracted field values and confidence scores
         """
-        # Decode if base64 string
-        if isinstance(image, str):
-            image = self.preprocessor.decode_base64_image(image)
+        result, _ = self.process_image_with_ocr_data(image, schema)
+        return result
+    
+    def process_image_with_ocr_data(
+        self,
+        image: Image.Image | bytes | str,
+        schema: "FormSchemaOutput"
+    ) -> tuple[OcrFormResult, dict[str, Any]]:
+        """
+        Process an image like process_image_to_form_result, also returning
+        the raw OCR data the form was extracted from.
         
+        Args:
+            image: PIL Image, encoded image file bytes, or base64-encoded
+                image string
+            schema: Form schema defining expected categories and fields
+            
+        Returns:
+            Tuple of (OcrFormResult, OCR result dictionary in the same shape
+            as process_image_ocr)
+        """
         # Run OCR
-        ocr_data = self.process_image_ocr(image)
+        ocr_data = self.process_image_ocr(decode_image(image))
+        
+        return self._build_form_result(ocr_data, schema), ocr_data
+    
+    def process_images_to_form_results(
+        self,
+        images: list[Image.Image | bytes | str],
+        schema: "FormSchemaOutput"
+    ) -> list[OcrFormResult]:
+        """
+        Process several images in one OCR batch and extract form data for each.
         
+        Args:
+            images: PIL Images, encoded image file bytes, or base64-encoded
+                image strings
+            schema: Form schema defining expected categories and fields
+            
+        Returns:
+            One OcrFormResult per image, in input order
+        """
+        ocr_batch = self.process_images_ocr([decode_image(image) for image in images])
+        return [self._build_form_result(ocr_data, schema) for ocr_data in ocr_batch]
+    
+    def _build_form_result(
+        self,
+        ocr_data: dict[str, Any],
+        schema: "FormSchemaOutput"
+    ) -> OcrFormResult:
+        """Extract field counts from one image's OCR data into an OcrFormResult."""
         # Extract field counts
         category_results = self.extract_field_counts(ocr_data['ocr_results'], schema)
         
@@ -414,38 +672,205 @@ class DataCardOCR:
 # Public API
 # =============================================================================
 
-# Global OCR instance (lazy initialization)
-_ocr_instance = None
+# Decoding doesn't depend on the preprocessing settings, so it needs no
+# DataCardOCR (and no pooled model instance)
+_DECODER = ImagePreprocessor()
+
+
+def decode_image(image: Image.Image | bytes | str) -> Image.Image:
+    """Decode a base64 string or encoded file bytes; pass PIL Images through."""
+    if isinstance(image, str):
+        return _DECODER.decode_base64_image(image)
+    if isinstance(image, bytes):
+        return _DECODER.decode_image_bytes(image)
+    return image
+
+
+# Pool of OCR instances (lazy initialization). Each instance has its own
+# Paddle predictors, so up to OCR_POOL_SIZE batches run inference at once.
+# Every instance holds a full set of models in memory, and Paddle already
+# spreads one inference over several CPU threads, so the pool is small.
+OCR_POOL_SIZE = 2
+_ocr_pool: Queue[DataCardOCR] | None = None
+_ocr_pool_lock = Lock()
+
+
+def _get_ocr_pool() -> Queue[DataCardOCR]:
+    """Get or create the global pool of OCR instances."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                pool = Queue()
+                # Split the cores between the instances instead of letting
+                # each run Paddle's default thread count
+                cpu_threads = max((os.cpu_count() or 1) // OCR_POOL_SIZE, 1)
+                for _ in range(OCR_POOL_SIZE):
+                    pool.put(DataCardOCR(cpu_threads=cpu_threads))
+                _ocr_pool = pool
+    return _ocr_pool
+
+
+@lru_cache(maxsize=4)
+def get_ocr(enhance_contrast: bool = False, denoise: bool = False) -> DataCardOCR:
+    """
+    Get a shared DataCardOCR with the given preprocessing options.
 
+    For scripts and interactive sessions: the models load once per set of
+    options instead of once per call. The server uses the instance pool.
+    """
+    return DataCardOCR(enhance_contrast=enhance_contrast, denoise=denoise)
 
-def get_ocr_instance() -> DataCardOCR:
-    """Get or create the global OCR instance."""
-    global _ocr_instance
-    if _ocr_instance is None:
-        _ocr_instance = DataCardOCR()
-    return _ocr_instance
+
+@contextmanager
+def borrow_ocr_instance() -> Iterator[DataCardOCR]:
+    """Check an OCR instance out of the pool, waiting if all are busy."""
+    pool = _get_ocr_pool()
+    ocr = pool.get()
+    try:
+        yield ocr
+    finally:
+        pool.put(ocr)
+
+
+def warm_up_ocr() -> None:
+    """
+    Load the OCR instances and run one inference on a blank image with each.
+
+    Model loading and the first inference's one-off setup take seconds;
+    doing them at startup keeps that cost out of the first upload. Failures
+    are logged, leaving the models to load on first use instead.
+    """
+    try:
+        pool = _get_ocr_pool()
+        blank = Image.new('RGB', (1296, 1296), color='white')
+
+        # Take every instance out at once so each one gets warmed
+        instances = [pool.get() for _ in range(OCR_POOL_SIZE)]
+        try:
+            for ocr in instances:
+                ocr.process_image_ocr(blank)
+        finally:
+            for ocr in instances:
+                pool.put(ocr)
+    except Exception:
+        logger.exception("OCR warm-up failed")
 
 
 def process_image(
-    image: str,  # base64-encoded image
+    image: Image.Image | bytes,  # decoded image or encoded image file bytes
     schema: "FormSchemaOutput",  # Pydantic model
 ) -> OcrFormResult:
     """
     Process a single image using OCR to extract form data.
 
     Args:
-        image: Base64-encoded image
+        image: Decoded PIL Image, or encoded image file bytes (e.g. PNG)
         schema: Form schema Pydantic model defining expected categories and fields
 
     Returns:
         OcrFormResult Pydantic model containing raw OCR values and confidence scores
         (before validation)
     """
-    ocr = get_ocr_instance()
+    with borrow_ocr_instance() as ocr:
+        try:
+            return ocr.process_image_to_form_result(image, schema)
+        except Exception:
+            # On error, return empty result
+            logger.exception("Error processing image")
+            return OcrFormResult(categories={})
+
+
+def process_images(
+    images: list[Image.Image | bytes],  # decoded images or encoded file bytes
+    schema: "FormSchemaOutput",  # Pydantic model
+) -> list[OcrFormResult | None]:
+    """
+    Process several images with a single batched OCR call.
+
+    Images fail one at a time: one that can't be decoded, OCR'd or parsed
+    gets None (the error is logged) without affecting the rest of its batch.
+    Callers can tell a failure apart from a card OCR found nothing on, and
+    retry it later instead of keeping the empty result.
+
+    Args:
+        images: Decoded PIL Images, or encoded image file bytes (e.g. PNG)
+        schema: Form schema Pydantic model defining expected categories and fields
+
+    Returns:
+        One OcrFormResult per image, in input order, containing raw OCR values
+        and confidence scores (before validation); None for images that
+        failed
+    """
+    # Load the models first: failing to load them is not an image error
+    _get_ocr_pool()
+
+    # Decode before borrowing an instance, so it isn't held idle meanwhile
+    decoded = [_decode_image_or_none(image) for image in images]
+    with borrow_ocr_instance() as ocr:
+        ocr_batch = _ocr_images_or_none(ocr, decoded)
+
+    # Field extraction doesn't touch the models, so it runs after the
+    # instance is back in the pool, where another batch can use it
+    return [
+        None if ocr_data is None
+        else _build_form_result_or_none(ocr, ocr_data, schema)
+        for ocr_data in ocr_batch
+    ]
+
+
+def _decode_image_or_none(image: Image.Image | bytes | str) -> Image.Image | None:
+    """Decode and load one image, or log the error and return None."""
+    try:
+        image = decode_image(image)
+        # Image.open only reads the header; surface truncated or corrupt
+        # pixel data here instead of in the middle of the batch
+        image.load()
+        return image
+    except Exception:
+        logger.exception("Error decoding image")
+        return None
+
+
+def _ocr_images_or_none(
+    ocr: DataCardOCR, images: list[Image.Image | None]
+) -> list[dict[str, Any] | None]:
+    """
+    OCR the decoded images in one batch, passing None entries through.
+
+    If the batch fails, its images are retried one at a time, so only the
+    image that breaks OCR ends up as None.
+    """
+    batch = [image for image in images if image is not None]
+    try:
+        results = ocr.process_images_ocr(batch)
+    except Exception:
+        if len(batch) == 1:
+            logger.exception("Error processing image")
+            results = [None]
+        else:
+            logger.exception("Error processing image batch, retrying images one at a time")
+            results = [_ocr_image_or_none(ocr, image) for image in batch]
+
+    results = iter(results)
+    return [None if image is None else next(results) for image in images]
+
+
+def _build_form_result_or_none(
+    ocr: DataCardOCR, ocr_data: dict[str, Any], schema: "FormSchemaOutput"
+) -> OcrFormResult | None:
+    """Extract one image's form result, or log the error and return None."""
+    try:
+        return ocr._build_form_result(ocr_data, schema)
+    except Exception:
+        logger.exception("Error extracting fields from image")
+        return None
+
 
+def _ocr_image_or_none(ocr: DataCardOCR, image: Image.Image) -> dict[str, Any] | None:
+    """OCR one image, or log the error and return None."""
     try:
-        return ocr.process_image_to_form_result(image, schema)
+        return ocr.process_image_ocr(image)
     except Exception:
-        # On error, return empty result
         logger.exception("Error processing image")
-        return OcrFormResult(categories={})
+        return None
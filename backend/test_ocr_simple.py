@@ -2,27 +2,42 @@
 """
 Quick test script for DataCardOCR - minimal dependencies version.
 
-This script tests the OCR with a simplified schema.
+This script tests the OCR with a simplified schema. Images are run through
+OCR in batches, with the next batch decoding in the background.
 
 Usage:
     cd backend
-    python test_ocr_simple.py
+    python test_ocr_simple.py [<image_path> ...]
 """
 
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add paths
 sys.path.insert(0, str(Path(__file__).parent))
 
-from PIL import Image
-from app.ocr import DataCardOCR
+# Images per OCR call, the same as the server's upload batches
+OCR_BATCH_SIZE = 8
+
+# A bare count, e.g. "=5" or "= 12"
+COUNT_TEXT = re.compile(r'=\s*\d+\s*')
+
+
+def load_image(path: str):
+    """Open and fully decode an image (PIL releases the GIL while decoding)."""
+    from PIL import Image
+    
+    image = Image.open(path)
+    image.load()
+    return image
 
 
 def main():
     """Run a simple OCR test."""
     
-    # Find a sample image
+    # Find sample images, preferring paths given on the command line
     sample_images = [
         "../sample_cards/IMG_5716.jpg",
         "../sample_cards/IMG_5715.jpg",
@@ -30,60 +45,86 @@ def main():
         "sample_cards/IMG_5715.jpg",
     ]
     
-    image_path = None
-    for path in sample_images:
-        if Path(path).exists():
-            image_path = path
-            break
+    if len(sys.argv) > 1:
+        image_paths = sys.argv[1:]
+    else:
+        # The same cards are listed relative to both the repo root and backend/
+        image_paths = []
+        seen = set()
+        for path in sample_images:
+            if Path(path).exists() and Path(path).resolve() not in seen:
+                seen.add(Path(path).resolve())
+                image_paths.append(path)
     
-    if not image_path:
+    if not image_paths:
         print("❌ No sample images found. Please provide an image path:")
-        print("   python test_ocr_simple.py <path_to_image>")
+        print("   python test_ocr_simple.py <path_to_image> [<path_to_image> ...]")
         return
     
-    if len(sys.argv) > 1:
-        image_path = sys.argv[1]
+    # Imported only once there is work to do: the OCR module loads PaddleOCR
+    from app.ocr import get_ocr
     
     print(f"\n{'='*80}")
     print(f"Testing DataCardOCR")
     print(f"{'='*80}\n")
-    print(f"Image: {image_path}\n")
-    
-    # Load image
-    print("📸 Loading image...")
-    image = Image.open(image_path)
-    print(f"   ✓ Loaded: {image.size[0]}x{image.size[1]} pixels\n")
+    for image_path in image_paths:
+        print(f"Image: {image_path}")
+    print()
     
-    # Initialize OCR
-    print("🔧 Initializing OCR (this may take a moment)...")
-    ocr = DataCardOCR(enhance_contrast=True, denoise=True)
-    print("   ✓ OCR ready\n")
-    
-    # Run OCR to get raw text
-    print("🔍 Running OCR...")
-    ocr_data = ocr.process_image_ocr(image)
-    print(f"   ✓ Detected {len(ocr_data['ocr_results'])} text items\n")
-    
-    # Display results
-    print(f"{'='*80}")
-    print("Detected Text (first 100 items):")
-    print(f"{'='*80}\n")
+    groups = [
+        image_paths[i:i + OCR_BATCH_SIZE]
+        for i in range(0, len(image_paths), OCR_BATCH_SIZE)
+    ]
     
-    for i, item in enumerate(ocr_data['ocr_results'][:100]):
-        conf = item['confidence'] * 100
-        text = item['text']
-        box = item['box']
+    with ThreadPoolExecutor(max_workers=OCR_BATCH_SIZE) as executor:
+        # Start decoding the first batch while the models load
+        pending = [executor.submit(load_image, path) for path in groups[0]]
         
-        # Highlight count patterns
-        if text.startswith('=') and text[1:].strip().isdigit():
-            marker = "🔢"
-        else:
-            marker = "  "
+        # Initialize OCR
+        print("🔧 Initializing OCR (this may take a moment)...")
+        ocr = get_ocr(enhance_contrast=True, denoise=True)
+        print("   ✓ OCR ready\n")
         
-        print(f"{marker} [{conf:5.1f}%] {text:40s} @ y={box[1]:4d}")
+        # Run OCR one batch at a time, decoding the next batch meanwhile
+        print("🔍 Running OCR...")
+        batch_data = []
+        for i, group in enumerate(groups):
+            images = [future.result() for future in pending]
+            if i + 1 < len(groups):
+                pending = [executor.submit(load_image, path) for path in groups[i + 1]]
+            
+            group_data = ocr.process_images_ocr(images)
+            for image_path, image, ocr_data in zip(group, images, group_data):
+                print(
+                    f"   ✓ {image_path} ({image.size[0]}x{image.size[1]}): "
+                    f"detected {len(ocr_data['ocr_results'])} text items"
+                )
+            batch_data.extend(group_data)
+    print()
     
-    if len(ocr_data['ocr_results']) > 100:
-        print(f"\n... and {len(ocr_data['ocr_results']) - 100} more items")
+    for image_path, ocr_data in zip(image_paths, batch_data):
+        # Display results
+        print(f"{'='*80}")
+        print(f"Detected Text in {image_path} (first 100 items):")
+        print(f"{'='*80}\n")
+        
+        # Format every line first and print them in one write
+        lines = []
+        for item in ocr_data['ocr_results'][:100]:
+            conf = item['confidence'] * 100
+            text = item['text']
+            box = item['box']
+            
+            # Highlight count patterns
+            marker = "🔢" if COUNT_TEXT.fullmatch(text) else "  "
+            
+            lines.append(f"{marker} [{conf:5.1f}%] {text:40s} @ y={box[1]:4d}")
+        if lines:
+            print("\n".join(lines))
+        
+        if len(ocr_data['ocr_results']) > 100:
+            print(f"\n... and {len(ocr_data['ocr_results']) - 100} more items")
+        print()
     
     print(f"\n{'='*80}")
     print("✓ Test completed successfully!")
@@ -1,3 +1,19 @@
 """
 Pytest configuration and fixtures for API tests.
 """
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    """
+    One test client shared by every test.
+
+    Not entered as a context manager: that would run the app's lifespan,
+    which loads and warms up the real OCR models. Tests mock OCR instead.
+    """
+    return TestClient(app)
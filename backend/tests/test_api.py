@@ -4,14 +4,21 @@ Tests for Keep Tahoe Blue API endpoints and functionality.
 
 import base64
 import json
+from collections import OrderedDict
+from functools import cache
 from io import BytesIO
 from pathlib import Path
-from fastapi.testclient import TestClient
+import zlib
+import pybase64
+import pytest
 from PIL import Image
+from PIL.PngImagePlugin import PngInfo
 
+from app import main as main_module
 from app.main import (
-    app,
     convert_image_to_base64,
+    count_issues,
+    is_rgb8_png,
     FieldStatus,
     KTBFormField,
     KTBFormCategory,
@@ -33,16 +40,33 @@ def make_jpeg(img: Image.Image) -> bytes:
     """Convert PIL image to JPEG bytes."""
     buffer = BytesIO()
     img.save(buffer, format='JPEG')
-    buffer.seek(0)
-    return buffer.read()
+    return buffer.getvalue()
 
 
 def make_png(img: Image.Image) -> bytes:
     """Convert PIL image to PNG bytes."""
     buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer.read()
+    # Test images are thrown away, so compress as little as possible
+    img.save(buffer, format='PNG', compress_level=1)
+    return buffer.getvalue()
+
+
+@cache
+def solid_jpeg(size: tuple[int, int], color) -> bytes:
+    """JPEG bytes of a solid-color RGB image, encoded once per size and color."""
+    return make_jpeg(Image.new('RGB', size, color=color))
+
+
+@cache
+def solid_png(mode: str, size: tuple[int, int], color) -> bytes:
+    """PNG bytes of a solid-color image, encoded once per mode, size and color."""
+    return make_png(Image.new(mode, size, color=color))
+
+
+@cache
+def make_metadata_json(count: int, prefix: str = "test-uuid") -> str:
+    """Upload metadata JSON for count files with empty metadata, uuids prefix-0, prefix-1, ..."""
+    return json.dumps([{"uuid": f"{prefix}-{i}", "metadata": {}} for i in range(count)])
 
 
 def make_ocr_result(category_data: dict) -> OcrFormResult:
@@ -70,15 +94,21 @@ def make_ocr_result(category_data: dict) -> OcrFormResult:
     return OcrFormResult(categories=categories)
 
 
+def mock_process_images(mocker, ocr_result: OcrFormResult):
+    """Patch batched OCR so every image in a batch gets ocr_result."""
+    return mocker.patch(
+        'app.main.process_images',
+        side_effect=lambda images, schema: [ocr_result] * len(images)
+    )
+
+
 class TestFormSchemaEndpoints:
     """Tests for form schema GET/PUT endpoints."""
 
-    def test_get_schema_when_no_schema_exists(self, tmp_path: Path, monkeypatch):
+    def test_get_schema_when_no_schema_exists(self, client, tmp_path: Path, monkeypatch):
         """Test GET /form-schema returns default schema when none exists."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         response = client.get("/form-schema")
 
         assert response.status_code == 200
@@ -95,12 +125,10 @@ class TestFormSchemaEndpoints:
         assert "Glass items" in category_names
         assert "Animal waste" in category_names
 
-    def test_put_schema_creates_new_schema(self, tmp_path: Path, monkeypatch):
+    def test_put_schema_creates_new_schema(self, client, tmp_path: Path, monkeypatch):
         """Test PUT /form-schema creates a new schema with timestamp."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -136,12 +164,10 @@ class TestFormSchemaEndpoints:
         assert "T" in data["updated_at"]
         assert data["updated_at"].endswith("Z")
 
-    def test_get_schema_returns_saved_schema(self, tmp_path: Path, monkeypatch):
+    def test_get_schema_returns_saved_schema(self, client, tmp_path: Path, monkeypatch):
         """Test GET /form-schema returns the previously saved schema."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -165,12 +191,10 @@ class TestFormSchemaEndpoints:
         assert data["categories"] == schema["categories"]
         assert data["updated_at"] == saved_timestamp
 
-    def test_put_schema_updates_existing_schema(self, tmp_path: Path, monkeypatch):
+    def test_put_schema_updates_existing_schema(self, client, tmp_path: Path, monkeypatch):
         """Test PUT /form-schema updates existing schema with new timestamp."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         initial_schema = {
             "categories": [
                 {
@@ -201,13 +225,11 @@ class TestFormSchemaEndpoints:
         assert timestamp2 > timestamp1  # New timestamp should be later
         assert response2.json()["categories"][0]["name"] == "Paper"
 
-    def test_schema_persists_to_file(self, tmp_path: Path, monkeypatch):
+    def test_schema_persists_to_file(self, client, tmp_path: Path, monkeypatch):
         """Test that schema is actually written to JSON file."""
-        import app.main as main_module
         schema_file = tmp_path / "form_schema.json"
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', schema_file)
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -228,19 +250,59 @@ class TestFormSchemaEndpoints:
         assert file_data["categories"] == schema["categories"]
 
 
+class TestSchemaCache:
+    """Tests for the cached schema read path."""
+
+    def test_get_schema_reuses_cached_schema(self, tmp_path: Path, monkeypatch):
+        """Test repeated reads of an unchanged file return the cached schema."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+
+        main_module.save_schema(main_module.FormSchemaInput(categories=[]))
+
+        first = main_module.get_schema()
+        second = main_module.get_schema()
+
+        assert first is second
+
+    def test_save_schema_leaves_no_temp_files(self, tmp_path: Path, monkeypatch):
+        """Test the atomic schema write cleans up after itself."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+
+        saved = main_module.save_schema(main_module.FormSchemaInput(categories=[]))
+
+        assert [p.name for p in tmp_path.iterdir()] == ["form_schema.json"]
+        assert main_module.get_schema() is saved
+
+    def test_get_schema_reloads_after_file_changes(self, tmp_path: Path, monkeypatch):
+        """Test an external edit to the schema file is picked up."""
+        schema_file = tmp_path / "form_schema.json"
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', schema_file)
+
+        main_module.save_schema(main_module.FormSchemaInput(categories=[]))
+        assert main_module.get_schema().categories == []
+
+        schema_file.write_text(json.dumps({
+            "categories": [{"name": "Metal", "fields": [{"name": "cans"}]}],
+            "updated_at": "2025-01-01T00:00:00Z",
+        }))
+
+        schema = main_module.get_schema()
+        assert [cat.name for cat in schema.categories] == ["Metal"]
+        assert schema.updated_at == "2025-01-01T00:00:00Z"
+
+
 class TestImageProcessing:
     """Tests for image/PDF processing functionality."""
 
     def test_process_jpg_image_to_base64(self):
         """Test JPG image is converted to base64 PNG."""
-        img = Image.new('RGB', (100, 100), color='red')
-        jpg_bytes = make_jpeg(img)
+        jpg_bytes = solid_jpeg((100, 100), 'red')
 
         result = convert_image_to_base64(jpg_bytes)
 
         # Verify it's a valid base64 string
         assert isinstance(result, str)
-        decoded = base64.b64decode(result)
+        decoded = pybase64.b64decode_as_bytearray(result)
 
         # Verify it's a valid PNG image
         img = Image.open(BytesIO(decoded))
@@ -250,48 +312,91 @@ class TestImageProcessing:
 
     def test_process_png_image_to_base64(self):
         """Test PNG image is converted to base64 PNG."""
-        img = Image.new('RGB', (100, 100), color='blue')
-        png_bytes = make_png(img)
+        png_bytes = solid_png('RGB', (100, 100), 'blue')
 
         result = convert_image_to_base64(png_bytes)
 
         # Verify it's a valid base64 string
         assert isinstance(result, str)
-        decoded = base64.b64decode(result)
+        decoded = pybase64.b64decode_as_bytearray(result)
 
         # Verify it's a valid PNG image
         img = Image.open(BytesIO(decoded))
         assert img.format == 'PNG'
         assert img.mode == 'RGB'
 
+    def test_process_rgb_png_is_passed_through(self):
+        """Test an RGB PNG is base64-encoded without being re-encoded."""
+        png_bytes = solid_png('RGB', (100, 100), 'blue')
+
+        result = convert_image_to_base64(png_bytes)
+
+        assert pybase64.b64decode_as_bytearray(result) == png_bytes
+
+    def test_process_png_with_metadata_is_reencoded(self):
+        """Test an RGB PNG carrying text chunks is re-encoded without them."""
+        info = PngInfo()
+        info.add_text("Comment", "x" * 1000)
+        buffer = BytesIO()
+        Image.new('RGB', (100, 100), 'blue').save(buffer, format='PNG', pnginfo=info)
+
+        result = pybase64.b64decode_as_bytearray(convert_image_to_base64(buffer.getvalue()))
+
+        assert result != buffer.getvalue()
+        assert b"tEXt" not in result
+        assert Image.open(BytesIO(result)).getpixel((0, 0)) == (0, 0, 255)
+
+    def test_interlaced_png_is_not_passed_through(self):
+        """Test an interlaced RGB PNG isn't treated as standardized."""
+        png_bytes = bytearray(solid_png('RGB', (100, 100), 'blue'))
+        assert is_rgb8_png(bytes(png_bytes))
+
+        # Set the interlace method and fix up the IHDR CRC
+        png_bytes[28] = 1
+        png_bytes[29:33] = zlib.crc32(png_bytes[12:29]).to_bytes(4, "big")
+
+        assert not is_rgb8_png(bytes(png_bytes))
+
+    def test_truncated_png_is_not_passed_through(self):
+        """Test a PNG cut off after its header is decoded rather than echoed back."""
+        png_bytes = make_png(Image.effect_noise((100, 100), 64).convert('RGB'))
+        truncated = png_bytes[:len(png_bytes) // 2]
+
+        assert not is_rgb8_png(truncated)
+        with pytest.raises(OSError):
+            convert_image_to_base64(truncated)
+
     def test_process_rgba_image_converts_to_rgb(self):
         """Test RGBA image is converted to RGB before encoding."""
-        img = Image.new('RGBA', (100, 100), color=(0, 255, 0, 128))
-        rgba_bytes = make_png(img)
+        rgba_bytes = solid_png('RGBA', (100, 100), (0, 255, 0, 128))
 
         result = convert_image_to_base64(rgba_bytes)
 
-        decoded = base64.b64decode(result)
+        decoded = pybase64.b64decode_as_bytearray(result)
         img = Image.open(BytesIO(decoded))
 
         # Verify conversion to RGB
         assert img.mode == 'RGB'
         assert img.format == 'PNG'
 
+    def test_process_image_preserves_channel_order(self):
+        """Test re-encoded images keep their RGB pixel values."""
+        result = convert_image_to_base64(solid_png('RGBA', (10, 10), (255, 0, 0, 255)))
+
+        decoded = Image.open(BytesIO(pybase64.b64decode_as_bytearray(result)))
+        assert decoded.getpixel((0, 0)) == (255, 0, 0)
+
     def test_process_image_standardizes_format(self):
         """Test that all images are standardized to the same format."""
-        jpg_img = Image.new('RGB', (50, 50), color='red')
-        jpg_bytes = make_jpeg(jpg_img)
-
-        png_img = Image.new('RGB', (50, 50), color='blue')
-        png_bytes = make_png(png_img)
+        jpg_bytes = solid_jpeg((50, 50), 'red')
+        png_bytes = solid_png('RGB', (50, 50), 'blue')
 
         jpg_result = convert_image_to_base64(jpg_bytes)
         png_result = convert_image_to_base64(png_bytes)
 
         # Both should decode to PNG format
-        jpg_decoded = Image.open(BytesIO(base64.b64decode(jpg_result)))
-        png_decoded = Image.open(BytesIO(base64.b64decode(png_result)))
+        jpg_decoded = Image.open(BytesIO(pybase64.b64decode_as_bytearray(jpg_result)))
+        png_decoded = Image.open(BytesIO(pybase64.b64decode_as_bytearray(png_result)))
 
         assert jpg_decoded.format == 'PNG'
         assert png_decoded.format == 'PNG'
@@ -342,6 +447,20 @@ class TestValidationLogic:
         assert field.value == "text123"
         assert field.status == FieldStatus.ERROR
 
+    def test_integer_strings_are_normalized(self):
+        """Test numeric strings are returned in canonical integer form."""
+        field = KTBFormField.from_ocr_field("test", OcrFieldResult(value="12", confidence=0.99))
+        assert field.value == "12"
+        assert field.status == FieldStatus.CONFIDENT
+
+        field = KTBFormField.from_ocr_field("test", OcrFieldResult(value="007", confidence=0.99))
+        assert field.value == "7"
+        assert field.status == FieldStatus.CONFIDENT
+
+        field = KTBFormField.from_ocr_field("test", OcrFieldResult(value=" 3", confidence=0.99))
+        assert field.value == "3"
+        assert field.status == FieldStatus.CONFIDENT
+
     def test_none_value_converted_to_zero(self):
         """Test None values are converted to '0'."""
         # None with high confidence
@@ -354,16 +473,29 @@ class TestValidationLogic:
         assert field.value == "0"
         assert field.status == FieldStatus.NEEDS_VALIDATION
 
+    def test_count_issues_counts_non_confident_fields(self):
+        """Test count_issues counts needs-validation and error fields."""
+        form = KTBForm(categories=[
+            KTBFormCategory(name="Plastics", fields=[
+                KTBFormField("bottles", "5", FieldStatus.CONFIDENT),
+                KTBFormField("bags", "3", FieldStatus.NEEDS_VALIDATION),
+            ]),
+            KTBFormCategory(name="Glass", fields=[
+                KTBFormField("jars", "x", FieldStatus.ERROR),
+            ]),
+        ])
+        result = KTBFormResult(uuid="test", image="", form=form)
+
+        assert count_issues(result) == 2
+
 
 class TestUploadEndpoint:
-    """Tests for the /upload endpoint."""
+    """Tests for the /upload-multipart endpoint."""
 
-    def test_upload_over_100_images_raises_validation_error(self, tmp_path: Path, monkeypatch):
+    def test_upload_over_100_images_raises_validation_error(self, client, tmp_path: Path, monkeypatch):
         """Test uploading > 100 images returns 400 validation error."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -377,21 +509,18 @@ class TestUploadEndpoint:
         client.put("/form-schema", json=schema)
 
         # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='red'))
+        image_bytes = solid_jpeg((50, 50), 'red')
 
         # Create 101 files
         files = [
-            ("files", (f"image_{i}.jpg", BytesIO(image_bytes), "image/jpeg"))
+            ("files", (f"image_{i}.jpg", image_bytes, "image/jpeg"))
             for i in range(101)
         ]
 
-        metadata = json.dumps([
-            {"uuid": f"test-uuid-{i}", "metadata": {}}
-            for i in range(101)
-        ])
+        metadata = make_metadata_json(101)
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -400,12 +529,10 @@ class TestUploadEndpoint:
         assert "Too many images" in response.json()["detail"]
         assert "100" in response.json()["detail"]
 
-    def test_upload_with_mismatched_metadata_count_raises_error(self, tmp_path: Path, monkeypatch):
+    def test_upload_with_mismatched_metadata_count_raises_error(self, client, tmp_path: Path, monkeypatch):
         """Test uploading files with mismatched metadata count returns 400 error."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -419,21 +546,18 @@ class TestUploadEndpoint:
         client.put("/form-schema", json=schema)
 
         # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='red'))
+        image_bytes = solid_jpeg((50, 50), 'red')
 
         # Create 3 files but only 2 metadata entries
         files = [
-            ("files", (f"image_{i}.jpg", BytesIO(image_bytes), "image/jpeg"))
+            ("files", (f"image_{i}.jpg", image_bytes, "image/jpeg"))
             for i in range(3)
         ]
 
-        metadata = json.dumps([
-            {"uuid": "test-uuid-0", "metadata": {}},
-            {"uuid": "test-uuid-1", "metadata": {}}
-        ])
+        metadata = make_metadata_json(2)
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -442,12 +566,10 @@ class TestUploadEndpoint:
         assert "Metadata count" in response.json()["detail"]
         assert "must match file count" in response.json()["detail"]
 
-    def test_upload_exactly_100_images_succeeds(self, tmp_path: Path, monkeypatch, mocker):
+    def test_upload_exactly_100_images_succeeds(self, client, tmp_path: Path, monkeypatch, mocker):
         """Test uploading exactly 100 images succeeds."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -472,8 +594,7 @@ class TestUploadEndpoint:
         client.put("/form-schema", json=schema)
 
         # Mock OCR to avoid processing overhead
-        mock_ocr = mocker.patch('app.main.process_image')
-        mock_ocr.return_value = make_ocr_result({
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
             "Plastics": {
                 "bottles": {"value": 5, "confidence": 0.99},
                 "bags": {"value": 3, "confidence": 0.99},
@@ -483,24 +604,21 @@ class TestUploadEndpoint:
                 "bottles": {"value": 1, "confidence": 0.99},
                 "jars": {"value": 0, "confidence": 0.99}
             }
-        })
+        }))
 
         # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='red'))
+        image_bytes = solid_jpeg((50, 50), 'red')
 
         # Create 100 files
         files = [
-            ("files", (f"image_{i}.jpg", BytesIO(image_bytes), "image/jpeg"))
+            ("files", (f"image_{i}.jpg", image_bytes, "image/jpeg"))
             for i in range(100)
         ]
 
-        metadata = json.dumps([
-            {"uuid": f"test-uuid-{i}", "metadata": {}}
-            for i in range(100)
-        ])
+        metadata = make_metadata_json(100)
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -508,16 +626,12 @@ class TestUploadEndpoint:
         assert response.status_code == 200
         assert len(response.json()["results"]) == 100
 
-    def test_upload_without_schema_uses_default(self, tmp_path: Path, monkeypatch, mocker):
+    def test_upload_without_schema_uses_default(self, client, tmp_path: Path, monkeypatch, mocker):
         """Test upload uses default schema if no schema is configured."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
-
         # Mock OCR to return results for default schema
-        mock_ocr = mocker.patch('app.main.process_image')
-        mock_ocr.return_value = make_ocr_result({
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
             "Plastic Items": {
                 "Cigarette butts": {"value": 5, "confidence": 0.99},
                 "Plastic bags": {"value": 3, "confidence": 0.99},
@@ -532,16 +646,16 @@ class TestUploadEndpoint:
                 "Other plastic pieces": {"value": None, "confidence": 0.99},
             }
             # Would need all 8 categories, but this is sufficient for the test
-        })
+        }))
 
         # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='red'))
+        image_bytes = solid_jpeg((50, 50), 'red')
 
-        files = [("files", ("image.jpg", BytesIO(image_bytes), "image/jpeg"))]
+        files = [("files", ("image.jpg", image_bytes, "image/jpeg"))]
         metadata = json.dumps([{"uuid": "test-uuid", "metadata": {}}])
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -552,12 +666,10 @@ class TestUploadEndpoint:
         assert "results" in data
         assert len(data["results"]) == 1
 
-    def test_upload_processes_and_returns_correct_structure(self, tmp_path: Path, monkeypatch, mocker):
+    def test_upload_processes_and_returns_correct_structure(self, client, tmp_path: Path, monkeypatch, mocker):
         """Test upload returns correctly structured response."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -582,8 +694,7 @@ class TestUploadEndpoint:
         client.put("/form-schema", json=schema)
 
         # Mock OCR
-        mock_ocr = mocker.patch('app.main.process_image')
-        mock_ocr.return_value = make_ocr_result({
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
             "Plastics": {
                 "bottles": {"value": 5, "confidence": 0.99},
                 "bags": {"value": 3, "confidence": 0.90},  # Low confidence
@@ -593,16 +704,16 @@ class TestUploadEndpoint:
                 "bottles": {"value": None, "confidence": 0.99},  # None -> 0
                 "jars": {"value": 2, "confidence": 0.95}
             }
-        })
+        }))
 
         # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='blue'))
+        image_bytes = solid_jpeg((50, 50), 'blue')
 
-        files = [("files", ("image.jpg", BytesIO(image_bytes), "image/jpeg"))]
+        files = [("files", ("image.jpg", image_bytes, "image/jpeg"))]
         metadata = json.dumps([{"uuid": "test-uuid-1", "metadata": {"location": "beach"}}])
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -647,12 +758,10 @@ class TestUploadEndpoint:
         assert glass_bottles["value"] == "0"  # None converted to 0
         assert glass_bottles["status"] == "confident"
 
-    def test_upload_results_sorted_by_issues(self, tmp_path: Path, monkeypatch, mocker):
+    def test_upload_results_sorted_by_issues(self, client, tmp_path: Path, monkeypatch, mocker):
         """Test upload results are sorted by number of issues (most first)."""
-        import app.main as main_module
         monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
 
-        client = TestClient(app)
         schema = {
             "categories": [
                 {
@@ -676,9 +785,12 @@ class TestUploadEndpoint:
         # Setup schema
         client.put("/form-schema", json=schema)
 
-        # Mock OCR with varying issues - use side_effect for multiple calls
-        mock_ocr = mocker.patch('app.main.process_image')
-        mock_ocr.side_effect = [
+        # Send all three images to OCR as one batch
+        monkeypatch.setattr(main_module, 'OCR_BATCH_WAIT', 60)
+
+        # Mock OCR with varying issues - one batch result per file, in file order
+        mock_ocr = mocker.patch('app.main.process_images')
+        mock_ocr.return_value = [
             make_ocr_result({  # image-1: 2 issues
                 "Plastics": {
                     "bottles": {"value": 5, "confidence": 0.99},  # confident
@@ -714,11 +826,15 @@ class TestUploadEndpoint:
             })
         ]
 
-        # Create a sample image
-        image_bytes = make_jpeg(Image.new('RGB', (50, 50), color='green'))
-
+        # Create a distinct sample image per file (identical bytes would be
+        # served from the form cache after the first OCR call)
+        colors = {1: 'green', 2: 'yellow', 3: 'purple'}
         files = [
-            ("files", (f"image-{i}.jpg", BytesIO(image_bytes), "image/jpeg"))
+            ("files", (
+                f"image-{i}.jpg",
+                solid_jpeg((50, 50), colors[i]),
+                "image/jpeg",
+            ))
             for i in range(1, 4)
         ]
         metadata = json.dumps([
@@ -727,7 +843,7 @@ class TestUploadEndpoint:
         ])
 
         response = client.post(
-            "/upload",
+            "/upload-multipart",
             files=files,
             data={"metadata": metadata}
         )
@@ -753,14 +869,216 @@ class TestUploadEndpoint:
         assert count_issues(results[1]) == 2
         assert count_issues(results[2]) == 0
 
+    def test_upload_splits_ocr_into_batches(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test large uploads are sent to OCR in batches of at most OCR_BATCH_SIZE."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+        monkeypatch.setattr(main_module, '_form_cache', OrderedDict())
+        monkeypatch.setattr(main_module, 'OCR_BATCH_SIZE', 4)
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
+            "Plastics": {"bottles": {"value": 4, "confidence": 0.99}}
+        }))
+
+        files = [
+            ("files", (f"image{i}.jpg", solid_jpeg((50, 50), (i * 20, 0, 0)), "image/jpeg"))
+            for i in range(10)
+        ]
+        metadata = make_metadata_json(10, prefix="uuid")
+
+        response = client.post("/upload-multipart", files=files, data={"metadata": metadata})
+
+        assert response.status_code == 200
+        assert sorted(r["uuid"] for r in response.json()["results"]) == [f"uuid-{i}" for i in range(10)]
+        batch_sizes = [len(call.args[0]) for call in mock_ocr.call_args_list]
+        assert sum(batch_sizes) == 10
+        assert max(batch_sizes) <= 4
+
+    def test_upload_stream_returns_one_result_per_line(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test the streaming upload returns each result as an NDJSON line."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+        monkeypatch.setattr(main_module, '_form_cache', OrderedDict())
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        mock_process_images(mocker, make_ocr_result({
+            "Plastics": {"bottles": {"value": 4, "confidence": 0.99}}
+        }))
+
+        files = [
+            ("files", (f"image{i}.jpg", solid_jpeg((50, 50), (i * 40, 0, 0)), "image/jpeg"))
+            for i in range(3)
+        ]
+        metadata = make_metadata_json(3, prefix="uuid")
+
+        response = client.post("/upload-multipart/stream", files=files, data={"metadata": metadata})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(r["uuid"] for r in results) == ["uuid-0", "uuid-1", "uuid-2"]
+        for result in results:
+            assert result["form"]["categories"][0]["fields"][0]["value"] == "4"
+            assert result["image"]
+
+    def test_upload_stream_reports_bad_image(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test a part that isn't an image gets an error line in the stream."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+        monkeypatch.setattr(main_module, '_form_cache', OrderedDict())
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        mock_process_images(mocker, make_ocr_result({
+            "Plastics": {"bottles": {"value": 4, "confidence": 0.99}}
+        }))
+
+        files = [
+            ("files", ("image0.jpg", solid_jpeg((50, 50), 'red'), "image/jpeg")),
+            ("files", ("image1.jpg", b"not an image", "image/jpeg")),
+        ]
+        metadata = make_metadata_json(2, prefix="uuid")
+
+        response = client.post("/upload-multipart/stream", files=files, data={"metadata": metadata})
+
+        assert response.status_code == 200
+        lines = {line["uuid"]: line for line in map(json.loads, response.text.splitlines())}
+        assert sorted(lines) == ["uuid-0", "uuid-1"]
+        assert lines["uuid-0"]["form"]["categories"][0]["fields"][0]["value"] == "4"
+        assert lines["uuid-1"] == {"uuid": "uuid-1", "error": "Could not process image"}
+
+    def test_upload_reuses_ocr_for_repeated_image(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test an image uploaded twice is only sent through OCR once."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+        monkeypatch.setattr(main_module, '_form_cache', OrderedDict())
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
+            "Plastics": {"bottles": {"value": 4, "confidence": 0.99}}
+        }))
+
+        image_bytes = solid_jpeg((50, 50), 'red')
+        metadata = json.dumps([{"uuid": "test-uuid", "metadata": {}}])
+
+        for _ in range(2):
+            response = client.post(
+                "/upload-multipart",
+                files=[("files", ("image.jpg", image_bytes, "image/jpeg"))],
+                data={"metadata": metadata}
+            )
+            assert response.status_code == 200
+            fields = response.json()["results"][0]["form"]["categories"][0]["fields"]
+            assert fields[0]["value"] == "4"
+
+        assert mock_ocr.call_count == 1
+
+    def test_upload_retries_ocr_after_failure(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test a form from failed OCR isn't cached, so resubmitting runs OCR again."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+        monkeypatch.setattr(main_module, '_form_cache', OrderedDict())
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        # Real process_images over a fake OCR instance whose first call fails
+        ocr = mocker.Mock()
+        ocr.process_images_ocr.side_effect = [
+            RuntimeError("model error"),
+            [{"ocr_results": [], "text_lines": []}],
+        ]
+        ocr._build_form_result.return_value = make_ocr_result({
+            "Plastics": {"bottles": {"value": 4, "confidence": 0.99}}
+        })
+        mocker.patch('app.ocr._get_ocr_pool')
+        mocker.patch('app.ocr.borrow_ocr_instance').return_value.__enter__.return_value = ocr
+
+        image_bytes = solid_jpeg((50, 50), 'blue')
+        metadata = json.dumps([{"uuid": "test-uuid", "metadata": {}}])
+
+        forms = []
+        for _ in range(2):
+            response = client.post(
+                "/upload-multipart",
+                files=[("files", ("image.jpg", image_bytes, "image/jpeg"))],
+                data={"metadata": metadata}
+            )
+            assert response.status_code == 200
+            forms.append(response.json()["results"][0]["form"])
+
+        assert forms[0]["categories"] == []
+        assert forms[1]["categories"][0]["fields"][0]["value"] == "4"
+        assert ocr.process_images_ocr.call_count == 2
+
+    def test_json_upload_decodes_base64_files(self, client, tmp_path: Path, monkeypatch, mocker):
+        """Test the JSON /upload route decodes base64 files and returns results."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+
+        client.put("/form-schema", json={
+            "categories": [{"name": "Plastics", "fields": [{"name": "bottles"}]}]
+        })
+
+        mock_ocr = mock_process_images(mocker, make_ocr_result({
+            "Plastics": {"bottles": {"value": 7, "confidence": 0.99}}
+        }))
+
+        image_bytes = solid_jpeg((50, 50), 'red')
+        payload = {
+            "files": [{
+                "uuid": "test-uuid",
+                "name": "image.jpg",
+                "type": "image/jpeg",
+                "size": len(image_bytes),
+                "base64": base64.b64encode(image_bytes).decode(),
+            }],
+            "metadata": "test-uuid",
+        }
+
+        response = client.post("/upload", json=payload)
+
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["uuid"] == "test-uuid"
+        assert result["form"]["categories"][0]["fields"][0]["value"] == "7"
+
+        # OCR receives the decoded image rather than a base64 string
+        assert isinstance(mock_ocr.call_args.args[0][0], Image.Image)
+
+    def test_json_upload_with_invalid_base64_raises_error(self, client, tmp_path: Path, monkeypatch):
+        """Test the JSON /upload route returns 400 for undecodable file content."""
+        monkeypatch.setattr(main_module, 'SCHEMA_FILE', tmp_path / "form_schema.json")
+
+        payload = {
+            "files": [{
+                "uuid": "test-uuid",
+                "name": "image.jpg",
+                "type": "image/jpeg",
+                "size": 4,
+                "base64": "not base64!",
+            }],
+            "metadata": "test-uuid",
+        }
+
+        response = client.post("/upload", json=payload)
+
+        assert response.status_code == 400
+        assert "Invalid base64" in response.json()["detail"]
+
 
 class TestCsvGenerationEndpoint:
     """Tests for the /generate-csv endpoint."""
 
-    def test_generate_csv_with_single_category(self):
+    def test_generate_csv_with_single_category(self, client):
         """Test CSV generation with single category and metadata fields."""
-        client = TestClient(app)
-
         request_data = {
             "metadata": [
                 {"name": "date", "value": "2024-01-15"},
@@ -796,10 +1114,8 @@ class TestCsvGenerationEndpoint:
         assert lines[1] == "bottles,5,Plastics,2024-01-15,Lake Tahoe"
         assert lines[2] == "bags,3,Plastics,2024-01-15,Lake Tahoe"
 
-    def test_generate_csv_with_multiple_categories(self):
+    def test_generate_csv_with_multiple_categories(self, client):
         """Test CSV generation with multiple categories."""
-        client = TestClient(app)
-
         request_data = {
             "metadata": [
                 {"name": "volunteer", "value": "John Doe"}
@@ -836,10 +1152,8 @@ class TestCsvGenerationEndpoint:
         assert lines[2] == "bottles,2,Glass,John Doe"
         assert lines[3] == "jars,1,Glass,John Doe"
 
-    def test_generate_csv_with_no_metadata(self):
+    def test_generate_csv_with_no_metadata(self, client):
         """Test CSV generation with no metadata fields."""
-        client = TestClient(app)
-
         request_data = {
             "metadata": [],
             "clean-up-data": [
@@ -864,10 +1178,8 @@ class TestCsvGenerationEndpoint:
         assert lines[0] == "field_name,value,category_name"
         assert lines[1] == "cans,15,Metal"
 
-    def test_generate_csv_with_zero_values(self):
+    def test_generate_csv_with_zero_values(self, client):
         """Test CSV generation handles zero values correctly."""
-        client = TestClient(app)
-
         request_data = {
             "metadata": [{"name": "session", "value": "morning"}],
             "clean-up-data": [
@@ -893,13 +1205,72 @@ class TestCsvGenerationEndpoint:
         assert lines[1] == "bottles,0,Plastics,morning"
         assert lines[2] == "bags,5,Plastics,morning"
 
+    def test_generate_csv_quotes_values_with_commas(self, client):
+        """Test metadata values containing commas are quoted."""
+        request_data = {
+            "metadata": [{"name": "location", "value": "Tahoe City, CA"}],
+            "clean-up-data": [
+                {
+                    "category": "Plastics",
+                    "fields": [{"name": "bottles", "value": 4}]
+                }
+            ]
+        }
+
+        response = client.post("/generate-csv", json=request_data)
+
+        assert response.status_code == 200
+        lines = response.text.strip().split('\n')
+        assert lines[1] == 'bottles,4,Plastics,"Tahoe City, CA"'
+
+    def test_generate_csv_with_invalid_body_returns_422(self, client):
+        """Test CSV generation rejects a body that fails validation."""
+        request_data = {
+            "metadata": [],
+            "clean-up-data": [
+                {
+                    "category": "Plastics",
+                    "fields": [{"name": "bottles", "value": "many"}]
+                }
+            ]
+        }
+
+        response = client.post("/generate-csv", json=request_data)
+
+        assert response.status_code == 422
+        error = response.json()["detail"][0]
+        assert error["loc"] == ["body", "clean-up-data", 0, "fields", 0, "value"]
+
+    def test_generate_csv_with_invalid_json_does_not_echo_body(self, client):
+        """Test a malformed JSON body is rejected without echoing it back."""
+        body = b'{"metadata": [' + b'"x", ' * 1000
+
+        response = client.post(
+            "/generate-csv", content=body, headers={"content-type": "application/json"}
+        )
+
+        assert response.status_code == 422
+        error = response.json()["detail"][0]
+        assert error["type"] == "json_invalid"
+        assert error["loc"][0] == "body"
+        assert error["input"] == {}
+
+    def test_raw_body_routes_document_request_body(self, client):
+        """Test routes that validate their own body still publish its schema."""
+        openapi = client.get("/openapi.json").json()
+
+        for path, model in [("/upload", "UploadPayload"), ("/generate-csv", "CsvGenerationRequest")]:
+            body = openapi["paths"][path]["post"]["requestBody"]
+            schema = body["content"]["application/json"]["schema"]
+            assert schema == {"$ref": f"#/components/schemas/{model}"}
+            assert model in openapi["components"]["schemas"]
+
 
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
 
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health endpoint returns healthy status."""
-        client = TestClient(app)
         response = client.get("/health")
         assert response.status_code == 200
         assert response.json() == {"status": "healthy"}
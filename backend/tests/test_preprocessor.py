@@ -0,0 +1,268 @@
+"""
+Tests for the image preprocessor.
+"""
+
+import pickle
+from io import BytesIO
+
+import numpy as np
+import pybase64
+import pytest
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter
+
+from utils.preprocessor import ImagePreprocessor
+
+
+# =============================================================================
+# Test Helper Functions
+# =============================================================================
+
+def png_base64(img: Image.Image, format: str = 'PNG') -> str:
+    """Encode an image as a base64 string, as PNG unless format says otherwise."""
+    buffer = BytesIO()
+    img.save(buffer, format=format)
+    return pybase64.b64encode_as_string(buffer.getvalue())
+
+
+def random_image(mode: str, size: tuple[int, int] = (61, 47), seed: int = 0) -> Image.Image:
+    """An RGB or L image of uniform random noise."""
+    rng = np.random.default_rng(seed)
+    shape = (size[1], size[0], 3) if mode == 'RGB' else (size[1], size[0])
+    return Image.fromarray(rng.integers(0, 256, shape, dtype=np.uint8), mode)
+
+
+def ruled_card(size: tuple[int, int] = (1200, 900)) -> Image.Image:
+    """A white greyscale card ruled with horizontal lines."""
+    img = Image.new('L', size, 255)
+    draw = ImageDraw.Draw(img)
+    for y in range(60, size[1] - 40, 50):
+        draw.line((40, y, size[0] - 40, y), fill=0, width=3)
+    return img
+
+
+def decode_case_png(mode: str) -> str:
+    """A base64 PNG in the given mode, for comparing decoders."""
+    image = random_image('RGB', (37, 29))
+    if mode == 'P+tRNS':
+        image = image.quantize(16)
+        image.info['transparency'] = 3
+    elif mode == 'P':
+        image = image.quantize(64)
+    elif mode == 'I;16':
+        pixels = np.asarray(image.convert('L'), dtype=np.uint16) * 257
+        image = Image.fromarray(pixels)
+    else:
+        image = image.convert(mode)
+    return png_base64(image)
+
+
+def pil_preprocess(image: Image.Image, enhance_contrast: bool, denoise: bool) -> Image.Image:
+    """The PIL filter chain preprocess_image reproduces."""
+    if enhance_contrast:
+        image = ImageEnhance.Contrast(image).enhance(1.2)
+    if denoise:
+        image = image.filter(ImageFilter.MedianFilter(size=3))
+    return image.filter(ImageFilter.SHARPEN)
+
+
+# =============================================================================
+# Tests
+# =============================================================================
+
+class TestProcessBatch:
+    """Tests for ImagePreprocessor.process_batch."""
+
+    def test_process_batch_keeps_input_order(self):
+        """Test results come back in the order the images were given."""
+        preprocessor = ImagePreprocessor(max_workers=4)
+        sizes = [(40 + i * 10, 30 + i) for i in range(8)]
+        images = [png_base64(Image.new('RGB', size, 'white')) for size in sizes]
+
+        try:
+            results = preprocessor.process_batch(images)
+        finally:
+            preprocessor.close()
+
+        assert [result.size for result in results] == sizes
+
+    def test_process_batch_of_one(self):
+        """Test a single image is processed without starting the thread pool."""
+        preprocessor = ImagePreprocessor()
+
+        results = preprocessor.process_batch([png_base64(Image.new('RGB', (40, 30), 'white'))])
+
+        assert [result.size for result in results] == [(40, 30)]
+        assert preprocessor._executor is None
+
+    @pytest.mark.parametrize("mode, format", [
+        ('RGB', 'PNG'), ('RGB', 'JPEG'), ('RGB', 'WEBP'),
+        ('L', 'PNG'), ('L', 'JPEG'), ('RGBA', 'PNG'),
+    ])
+    @pytest.mark.parametrize("auto_rotate_images", [True, False])
+    def test_process_batch_matches_pil_methods(self, mode, format, auto_rotate_images):
+        """Test the numpy pipeline gives the same pixels as the public PIL methods."""
+        preprocessor = ImagePreprocessor()
+        card = ruled_card((900, 700)).rotate(6, expand=True, fillcolor=255)
+        base64_img = png_base64(card.convert(mode), format)
+
+        result, = preprocessor.process_batch([base64_img], auto_rotate_images)
+
+        expected = preprocessor.decode_base64_image(base64_img)
+        if auto_rotate_images:
+            expected = preprocessor.auto_rotate(expected)
+        expected = preprocessor.preprocess_image(expected)
+        assert result.mode == expected.mode
+        np.testing.assert_array_equal(np.asarray(result), np.asarray(expected))
+
+    def test_preprocessor_pickles_after_process_batch(self):
+        """Test the thread pool started by process_batch isn't pickled."""
+        preprocessor = ImagePreprocessor(max_workers=2)
+        images = [png_base64(Image.new('RGB', (40, 30), 'white'))] * 2
+
+        try:
+            preprocessor.process_batch(images)
+            copy = pickle.loads(pickle.dumps(preprocessor))
+        finally:
+            preprocessor.close()
+
+        assert copy.max_workers == 2
+        assert [result.size for result in copy.process_batch(images)] == [(40, 30)] * 2
+        copy.close()
+
+
+class TestPreprocessImage:
+    """Tests for the OpenCV contrast/denoise/sharpen pass."""
+
+    @pytest.mark.parametrize("mode", ['RGB', 'L'])
+    @pytest.mark.parametrize("enhance_contrast", [True, False])
+    @pytest.mark.parametrize("denoise", [True, False])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_preprocess_matches_pil_filters(self, mode, enhance_contrast, denoise, seed):
+        """Test the OpenCV pass gives exactly the PIL filter chain's pixels."""
+        preprocessor = ImagePreprocessor(enhance_contrast=enhance_contrast, denoise=denoise)
+        image = random_image(mode, seed=seed)
+
+        result = preprocessor.preprocess_image(image)
+
+        expected = pil_preprocess(image, enhance_contrast, denoise)
+        assert result.mode == expected.mode
+        np.testing.assert_array_equal(np.asarray(result), np.asarray(expected))
+
+    def test_sharpen_rounds_ties_up(self):
+        """Test sharpened values exactly halfway between two levels round up, as in PIL."""
+        preprocessor = ImagePreprocessor(enhance_contrast=False, denoise=False)
+        pixels = np.full((5, 5), 10, dtype=np.uint8)
+        # Centre sharpens to (32 * 10 - 2 * (7 * 10 + 6)) / 16 = 10.5
+        pixels[1, 2] = 6
+        image = Image.fromarray(pixels)
+
+        result = np.asarray(preprocessor.preprocess_image(image))
+
+        assert result[2, 2] == 11
+        np.testing.assert_array_equal(result, np.asarray(image.filter(ImageFilter.SHARPEN)))
+
+
+class TestAutoRotate:
+    """Tests for skew detection and rotation."""
+
+    @pytest.mark.parametrize("skew", [3, -5, 8])
+    def test_auto_rotate_undoes_skew(self, mocker, skew):
+        """Test a skewed card is rotated back by its skew angle."""
+        preprocessor = ImagePreprocessor()
+        rotate = mocker.patch.object(
+            preprocessor, '_rotate_expand', wraps=preprocessor._rotate_expand
+        )
+        image = ruled_card().rotate(skew, expand=True, fillcolor=255)
+
+        preprocessor.auto_rotate(image)
+
+        rotate.assert_called_once()
+        assert rotate.call_args.args[1] == pytest.approx(-skew, abs=0.5)
+
+    def test_auto_rotate_leaves_straight_card(self):
+        """Test a card with no skew is returned unchanged."""
+        preprocessor = ImagePreprocessor()
+        image = ruled_card()
+
+        assert preprocessor.auto_rotate(image) is image
+
+    @pytest.mark.parametrize("angle", [3, -7.5, 30, -44])
+    def test_rotate_expand_matches_pil_canvas(self, angle):
+        """Test the rotated canvas has Image.rotate(expand=True)'s size and placement."""
+        preprocessor = ImagePreprocessor()
+        image = ruled_card((301, 200)).convert('RGB')
+
+        result = preprocessor._rotate_expand(np.asarray(image), angle)
+
+        expected = np.asarray(image.rotate(
+            angle, resample=Image.Resampling.BILINEAR, expand=True, fillcolor='white'
+        ))
+        assert result.shape == expected.shape
+        # Both are bilinear; only edge pixels differ slightly
+        assert np.abs(result.astype(np.int16) - expected).mean() < 1
+
+
+class TestResize:
+    """Tests for the INTER_AREA downscale path."""
+
+    @pytest.mark.parametrize("size, expected", [
+        ((4032, 3024), (1296, 972)),
+        ((1500, 1000), (1296, 864)),
+        ((1000, 3000), (432, 1296)),
+        ((800, 600), (800, 600)),
+    ])
+    def test_resize_fits_max_size(self, size, expected):
+        """Test images are shrunk to fit 1296 px, keeping the aspect ratio."""
+        preprocessor = ImagePreprocessor()
+
+        result = preprocessor.resize_image_if_needed(Image.new('RGB', size, 'white'))
+
+        assert result.size == expected
+        assert result.mode == 'RGB'
+
+    def test_resize_averages_pixel_areas(self):
+        """Test an exact 2x shrink gives each 2x2 block's mean."""
+        preprocessor = ImagePreprocessor()
+        image = random_image('L', (2592, 1944))
+
+        result = np.asarray(preprocessor.resize_image_if_needed(image), dtype=np.float32)
+
+        blocks = np.asarray(image, dtype=np.float32).reshape(972, 2, 1296, 2)
+        np.testing.assert_allclose(result, blocks.mean(axis=(1, 3)), atol=0.5)
+
+    @pytest.mark.parametrize("size", [(4032, 3024), (1500, 1000), (1000, 3000)])
+    def test_resize_close_to_lanczos(self, size):
+        """Test INTER_AREA stays within a grey level of LANCZOS on a photo-like image."""
+        preprocessor = ImagePreprocessor()
+        image = ruled_card(size).filter(ImageFilter.GaussianBlur(4)).convert('RGB')
+
+        result = preprocessor.resize_image_if_needed(image)
+
+        expected = image.resize(result.size, Image.Resampling.LANCZOS)
+        assert np.abs(np.asarray(result, dtype=np.int16) - np.asarray(expected)).mean() < 1
+
+    def test_high_quality_resize_uses_lanczos(self):
+        """Test high_quality_resize keeps PIL's LANCZOS resize."""
+        preprocessor = ImagePreprocessor(high_quality_resize=True)
+        image = random_image('RGB', (2000, 1500))
+
+        result = preprocessor.resize_image_if_needed(image)
+
+        expected = image.resize((1296, 972), Image.Resampling.LANCZOS, reducing_gap=1.5)
+        np.testing.assert_array_equal(np.asarray(result), np.asarray(expected))
+
+
+class TestDecode:
+    """Tests for decoding base64 images to arrays."""
+
+    @pytest.mark.parametrize("mode", ['RGB', 'L', 'RGBA', 'P', 'P+tRNS', 'LA', 'I;16', '1'])
+    def test_decode_to_ndarray_matches_pil(self, mode):
+        """Test OpenCV decoding gives the same pixels as decode_base64_image."""
+        preprocessor = ImagePreprocessor()
+        base64_img = decode_case_png(mode)
+
+        result = preprocessor._decode_base64_to_ndarray(base64_img)
+
+        expected = np.asarray(preprocessor.decode_base64_image(base64_img))
+        assert result.dtype == np.uint8
+        np.testing.assert_array_equal(result, expected)
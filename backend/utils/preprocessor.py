@@ -3,16 +3,77 @@ Image preprocessing utilities for data card processing.
 Handles base64 decoding, image enhancement, and preparation for vision models.
 """
 
-import base64
+import binascii
 import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
 from typing import List, Tuple, Optional
 from PIL import Image, ImageEnhance, ImageFilter
 import numpy as np
 import cv2
 import logging
+import pybase64
 
 logger = logging.getLogger(__name__)
 
+# Longest data URI prefix ("data:image/png;base64,") searched for its comma
+DATA_URI_PREFIX_LIMIT = 256
+
+# Long side auto_rotate downsamples to before looking for lines
+ROTATION_DETECT_SIZE = 256
+# Strongest Hough lines whose median angle is taken as the skew
+ROTATION_MAX_LINES = 50
+
+# ImageFilter.SHARPEN's kernel, normalized by its weight sum of 16, for the
+# OpenCV path. Eighths and sixteenths are exact in float32.
+SHARPEN_KERNEL = np.array(
+    [[-2, -2, -2],
+     [-2, 32, -2],
+     [-2, -2, -2]],
+    dtype=np.float32
+) / 16
+
+# ImageFilter.MedianFilter(size=3), for the OpenCV path
+MEDIAN_KSIZE = 3
+
+# Input values a contrast lookup table maps
+LUT_VALUES = np.arange(256, dtype=np.float32)
+
+
+@lru_cache(maxsize=256)
+def _contrast_lut(mean: int) -> np.ndarray:
+    """
+    ImageEnhance.Contrast(1.2)'s lookup table around a mean grey level.
+    
+    Only 256 means exist, so each table is built once per process.
+    """
+    lut = np.clip(mean + np.float32(1.2) * (LUT_VALUES - mean), 0, 255)
+    lut = lut.astype(np.uint8)
+    # Shared between calls and threads
+    lut.flags.writeable = False
+    return lut
+
+
+def _fit_within(width: int, height: int, max_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Size that shrinks width x height to fit max_size, keeping the aspect
+    ratio; None if it already fits.
+    """
+    if width <= max_size and height <= max_size:
+        return None
+    
+    # Calculate new size maintaining aspect ratio
+    if width > height:
+        new_width = max_size
+        new_height = int((max_size / width) * height)
+    else:
+        new_height = max_size
+        new_width = int((max_size / height) * width)
+    
+    return new_width, new_height
+
 
 class ImagePreprocessor:
     """Handles preprocessing of data card images for optimal OCR/vision model performance."""
@@ -21,7 +82,9 @@ class ImagePreprocessor:
         self,
         target_size: int = None,
         enhance_contrast: bool = True,
-        denoise: bool = True
+        denoise: bool = True,
+        max_workers: Optional[int] = None,
+        high_quality_resize: bool = False
     ):
         """
         Initialize the preprocessor.
@@ -30,10 +93,38 @@ class ImagePreprocessor:
             target_size: Optional (width, height) to resize images
             enhance_contrast: Whether to enhance image contrast
             denoise: Whether to apply denoising
+            max_workers: Threads for process_batch (half the CPUs if None)
+            high_quality_resize: Downscale with PIL's LANCZOS instead of
+                OpenCV's INTER_AREA
         """
         self.target_size = target_size
         self.enhance_contrast = enhance_contrast
         self.denoise = denoise
+        self.max_workers = max_workers or max((os.cpu_count() or 1) // 2, 1)
+        self.high_quality_resize = high_quality_resize
+        
+        # Created on the first process_batch call
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+    
+    def __getstate__(self) -> dict:
+        # Thread pools and locks can't be pickled; an unpickled copy starts
+        # its own pool when it needs one
+        state = self.__dict__.copy()
+        del state['_executor'], state['_executor_lock']
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._executor = None
+        self._executor_lock = Lock()
+    
+    def close(self) -> None:
+        """Shut down the process_batch thread pool, if one was started."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
     
     def decode_base64_image(self, base64_string: str) -> Image.Image:
         """
@@ -45,13 +136,79 @@ class ImagePreprocessor:
         Returns:
             PIL Image object
         """
-        # Remove data URI prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
+        return self.decode_image_bytes(self._decode_base64_bytes(base64_string))
+    
+    def _decode_base64_bytes(self, base64_string: str) -> bytes:
+        """Base64-decode an image string, dropping any data URI prefix."""
+        # Remove data URI prefix if present. Commas aren't in the base64
+        # alphabet, so only the short prefix needs searching, not the payload.
+        comma = base64_string.find(',', 0, DATA_URI_PREFIX_LIMIT)
+        if comma != -1:
+            base64_string = base64_string[comma + 1:]
+        
+        # Strict decoding takes the SIMD fast path; the lenient one skips
+        # non-alphabet characters byte by byte, which line-wrapped (MIME) or
+        # whitespace-padded payloads need
+        try:
+            return pybase64.b64decode(base64_string, validate=True)
+        except binascii.Error:
+            return pybase64.b64decode(base64_string)
+    
+    def _decode_base64_to_ndarray(self, base64_string: str) -> np.ndarray:
+        """
+        Decode a base64 encoded image string to an RGB or greyscale array.
+        
+        Same pixels as np.asarray(decode_base64_image(...)), but decoded by
+        OpenCV straight into the array the rest of process_batch works on.
+        
+        Args:
+            base64_string: Base64 encoded image string
+            
+        Returns:
+            uint8 HxWx3 RGB or HxW greyscale array
+        """
+        image_data = self._decode_base64_bytes(base64_string)
         
-        image_data = base64.b64decode(base64_string)
+        # Image.open only parses the header. libpng expands palette and
+        # grey+alpha PNGs to BGR(A) while decoding, giving the same pixels
+        # as PIL's separate convert('RGB') pass. Modes OpenCV converts
+        # differently (1-bit, 16-bit, CMYK, ...) and formats it can't read
+        # stay with PIL.
         image = Image.open(io.BytesIO(image_data))
+        if not (
+            image.mode in ('RGB', 'L', 'RGBA')
+            or (image.format == 'PNG' and image.mode in ('P', 'LA'))
+        ):
+            return np.asarray(self._to_rgb_or_l(image))
         
+        # IGNORE_ORIENTATION: PIL doesn't apply EXIF rotation either
+        arr = cv2.imdecode(
+            np.frombuffer(image_data, np.uint8),
+            cv2.IMREAD_UNCHANGED | cv2.IMREAD_IGNORE_ORIENTATION
+        )
+        if arr is None:
+            return np.asarray(self._to_rgb_or_l(image))
+        
+        if arr.ndim == 2:
+            return arr
+        if arr.shape[2] == 4:
+            return cv2.cvtColor(arr, cv2.COLOR_BGRA2RGB)
+        return cv2.cvtColor(arr, cv2.COLOR_BGR2RGB)
+    
+    def decode_image_bytes(self, image_data: bytes) -> Image.Image:
+        """
+        Decode encoded image file bytes (PNG, JPEG, ...) to PIL Image.
+        
+        Args:
+            image_data: Encoded image file bytes
+            
+        Returns:
+            PIL Image object
+        """
+        return self._to_rgb_or_l(Image.open(io.BytesIO(image_data)))
+    
+    def _to_rgb_or_l(self, image: Image.Image) -> Image.Image:
+        """Convert a freshly opened image to RGB unless it is RGB or L."""
         # Convert to RGB if needed
         if image.mode not in ('RGB', 'L'):
             image = image.convert('RGB')
@@ -70,31 +227,90 @@ class ImagePreprocessor:
             Base64 encoded string
         """
         buffer = io.BytesIO()
-        image.save(buffer, format=format)
-        buffer.seek(0)
-        return base64.b64encode(buffer.read()).decode('utf-8')
+        if format.upper() == 'JPEG':
+            # Pinned so the output does not depend on PIL's defaults
+            image.save(
+                buffer, format=format, quality=85,
+                optimize=False, progressive=False
+            )
+        else:
+            image.save(buffer, format=format)
+        # Encode straight from the buffer's memory instead of a bytes copy
+        return pybase64.b64encode_as_string(buffer.getbuffer())
     
     def resize_image_if_needed(self, image: Image.Image, max_size=1296):
         """Resize image if it exceeds max_size on any dimension."""
-        width, height = image.size
-        
-        if width <= max_size and height <= max_size:
-            logging.info(f"Image size {width}x{height} is within limits")
+        new_size = self._fit_size(*image.size, max_size)
+        if new_size is None:
             return image
+        new_width, new_height = new_size
         
-        # Calculate new size maintaining aspect ratio
-        if width > height:
-            new_width = max_size
-            new_height = int((max_size / width) * height)
-        else:
-            new_height = max_size
-            new_width = int((max_size / height) * width)
+        if not self.high_quality_resize and image.mode in ('RGB', 'L'):
+            return self._resize_fast(image, (new_width, new_height))
         
-        logging.info(f"Resizing image from {width}x{height} to {new_width}x{new_height}")
-        image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # reducing_gap first shrinks by an integer factor with a cheap box
+        # filter, then applies LANCZOS to the smaller image. At 1.5 a 4032px
+        # phone photo is reduced 2x first: ~3x faster, and within a fraction
+        # of a grey level of a full LANCZOS resize.
+        image = image.resize(
+            (new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=1.5
+        )
         
         return image
     
+    def _fit_size(self, width: int, height: int, max_size: int) -> Optional[Tuple[int, int]]:
+        """Size to shrink width x height to so it fits max_size, or None."""
+        new_size = _fit_within(width, height, max_size)
+        if new_size is None:
+            logger.debug("Image size %dx%d is within limits", width, height)
+        else:
+            logger.info(
+                "Resizing image from %dx%d to %dx%d", width, height, *new_size
+            )
+        return new_size
+    
+    def _resize_array(self, arr: np.ndarray, max_size=1296) -> np.ndarray:
+        """resize_image_if_needed for an RGB or greyscale array."""
+        height, width = arr.shape[:2]
+        new_size = self._fit_size(width, height, max_size)
+        if new_size is None:
+            return arr
+        
+        if self.high_quality_resize:
+            image = Image.fromarray(arr).resize(
+                new_size, Image.Resampling.LANCZOS, reducing_gap=1.5
+            )
+            return np.asarray(image)
+        
+        # INTER_AREA has a SIMD fast path for exact halving, so halve while
+        # that stays above the target (cropping an odd row/column), then
+        # finish with one general INTER_AREA step
+        while width >= 2 * new_size[0] and height >= 2 * new_size[1]:
+            height, width = height // 2, width // 2
+            arr = cv2.resize(
+                arr[:height * 2, :width * 2], (width, height),
+                interpolation=cv2.INTER_AREA
+            )
+        return cv2.resize(arr, new_size, interpolation=cv2.INTER_AREA)
+    
+    def _resize_fast(self, image: Image.Image, new_size: Tuple[int, int]) -> Image.Image:
+        """
+        Downscale with OpenCV's INTER_AREA (pixel-area averaging).
+        
+        For shrinking it is alias-free like LANCZOS, and several times
+        faster; OCR accuracy doesn't depend on the difference.
+        """
+        # Box-reduce by the whole factor first: that is area averaging too,
+        # and it shrinks the PIL -> numpy copy, which dominates for photos
+        factor = min(image.width // new_size[0], image.height // new_size[1])
+        if factor >= 2:
+            image = image.reduce(factor)
+        
+        resized = cv2.resize(
+            np.asarray(image), new_size, interpolation=cv2.INTER_AREA
+        )
+        return Image.fromarray(resized)
+    
     def preprocess_image(self, image: Image.Image) -> Image.Image:
         """
         Apply preprocessing steps to enhance image for vision model.
@@ -112,6 +328,9 @@ class ImagePreprocessor:
             # Use default max_size
             image = self.resize_image_if_needed(image)
         
+        if image.mode in ('RGB', 'L') and min(image.size) >= 3:
+            return Image.fromarray(self._preprocess_array(np.asarray(image)))
+        
         # Enhance contrast
         if self.enhance_contrast:
             image = self._enhance_contrast(image)
@@ -125,6 +344,41 @@ class ImagePreprocessor:
         
         return image
     
+    def _preprocess_array(self, arr: np.ndarray) -> np.ndarray:
+        """
+        Contrast, denoise and sharpen in OpenCV on one array.
+        
+        Gives the same pixels as the PIL filter chain below, without
+        materializing a PIL image per step; OpenCV's median and kernel
+        filters are also much faster than PIL's.
+        
+        Args:
+            arr: uint8 RGB or greyscale array, at least 3x3
+            
+        Returns:
+            Preprocessed array
+        """
+        # Contrast is a per-value linear map around the mean grey level, so
+        # one lookup table does it (same float32 math and truncation as PIL)
+        if self.enhance_contrast:
+            # PIL's own luma: cv2's RGB2GRAY rounds differently
+            gray = arr if arr.ndim == 2 else np.asarray(Image.fromarray(arr).convert('L'))
+            arr = cv2.LUT(arr, _contrast_lut(int(gray.mean() + 0.5)))
+        
+        # Same 3x3 median as PIL, with the same replicated border
+        if self.denoise:
+            arr = cv2.medianBlur(arr, MEDIAN_KSIZE)
+        
+        # SHARPEN straight to saturated uint8 in one pass. Sums are exact
+        # multiples of 1/16, so the 1/64 delta only moves exact .5 ties
+        # upwards: PIL rounds half up, OpenCV half to even.
+        sharpened = cv2.filter2D(arr, cv2.CV_8U, SHARPEN_KERNEL, delta=1 / 64)
+        # PIL leaves the one-pixel border unfiltered
+        sharpened[0], sharpened[-1] = arr[0], arr[-1]
+        sharpened[:, 0], sharpened[:, -1] = arr[:, 0], arr[:, -1]
+        
+        return sharpened
+    
     def _enhance_contrast(self, image: Image.Image) -> Image.Image:
         """Enhance image contrast - use gentle enhancement."""
         enhancer = ImageEnhance.Contrast(image)
@@ -154,36 +408,82 @@ class ImagePreprocessor:
         Returns:
             Rotated PIL Image
         """
-        # Convert to numpy array for OpenCV processing
-        img_array = np.array(image)
-        
+        img_array = np.asarray(image)
+        rotated = self._auto_rotate_array(img_array)
+        if rotated is img_array:
+            return image
+        return Image.fromarray(rotated)
+    
+    def _auto_rotate_array(self, img_array: np.ndarray) -> np.ndarray:
+        """auto_rotate for an RGB or greyscale array; returns it if unrotated."""
         # Convert to grayscale
         if len(img_array.shape) == 3:
             gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
         else:
             gray = img_array
         
+        # Line angles don't depend on resolution, so detect them on a small
+        # copy; Hough votes scale with line length, so the threshold does too
+        threshold = 200
+        scale = ROTATION_DETECT_SIZE / max(gray.shape)
+        if scale < 1:
+            gray = cv2.resize(
+                gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+            threshold = max(int(threshold * scale), 1)
+        
         # Detect edges
         edges = cv2.Canny(gray, 50, 150, apertureSize=3)
         
         # Detect lines using Hough transform
-        lines = cv2.HoughLines(edges, 1, np.pi / 180, 200)
+        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold)
         
         if lines is not None and len(lines) > 0:
-            # Calculate average angle
-            angles = []
-            for line in lines[:10]:  # Use first 10 lines
-                rho, theta = line[0]
-                angle = np.degrees(theta) - 90
-                angles.append(angle)
-            
-            avg_angle = np.median(angles)
+            # Median angle of the strongest lines, folded into [-45, 45) so
+            # near-vertical lines (theta ~ 0) count as skew of the vertical
+            # family instead of as a -90 degree rotation
+            thetas = lines[:ROTATION_MAX_LINES, 0, 1]
+            angles = (np.degrees(thetas) - 90.0 + 45.0) % 90.0 - 45.0
+            avg_angle = float(np.median(angles))
             
             # Rotate if angle is significant
             if abs(avg_angle) > 1:
-                image = image.rotate(avg_angle, expand=True, fillcolor='white')
+                return self._rotate_expand(img_array, avg_angle)
         
-        return image
+        return img_array
+    
+    def _rotate_expand(self, img_array: np.ndarray, angle: float) -> np.ndarray:
+        """
+        Rotate counter-clockwise by angle degrees, growing the canvas to fit.
+        
+        Same geometry as Image.rotate(angle, expand=True, fillcolor='white'),
+        done with cv2.warpAffine.
+        """
+        height, width = img_array.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        
+        # Bounding box of the rotated corners, rounded outwards as PIL does,
+        # and shift the image back into view
+        cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+        half_width = (width * cos + height * sin) / 2
+        half_height = (width * sin + height * cos) / 2
+        new_width = int(
+            np.ceil(width / 2 + half_width) - np.floor(width / 2 - half_width)
+        )
+        new_height = int(
+            np.ceil(height / 2 + half_height) - np.floor(height / 2 - half_height)
+        )
+        matrix[0, 2] += (new_width - width) / 2
+        matrix[1, 2] += (new_height - height) / 2
+        
+        white = (255,) * (img_array.shape[2] if img_array.ndim == 3 else 1)
+        rotated = cv2.warpAffine(
+            img_array, matrix, (new_width, new_height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=white
+        )
+        return rotated
     
     def process_batch(
         self,
@@ -198,24 +498,47 @@ class ImagePreprocessor:
             auto_rotate_images: Whether to apply automatic rotation correction
             
         Returns:
-            List of preprocessed PIL Images
+            List of preprocessed PIL Images, in input order
         """
-        processed_images = []
+        if len(base64_images) <= 1:
+            return [
+                self._process_one(base64_img, auto_rotate_images)
+                for base64_img in base64_images
+            ]
         
-        for base64_img in base64_images:
-            # Decode
-            image = self.decode_base64_image(base64_img)
-            
-            # Auto-rotate if enabled
-            if auto_rotate_images:
-                image = self.auto_rotate(image)
-            
-            # Preprocess
-            image = self.preprocess_image(image)
-            
-            processed_images.append(image)
+        # Decoding, OpenCV and PIL filters all release the GIL, so images are
+        # processed in parallel on threads
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="preprocess"
+                )
+            executor = self._executor
+        return list(executor.map(
+            self._process_one,
+            base64_images,
+            [auto_rotate_images] * len(base64_images)
+        ))
+    
+    def _process_one(self, base64_img: str, auto_rotate_images: bool) -> Image.Image:
+        """Decode, optionally auto-rotate, and preprocess one image."""
+        # Stays a numpy array throughout, so each step reads the previous
+        # one's pixels directly instead of through a PIL <-> numpy copy
+        arr = self._decode_base64_to_ndarray(base64_img)
+        
+        # Auto-rotate if enabled
+        if auto_rotate_images:
+            arr = self._auto_rotate_array(arr)
+        
+        # Resize, as preprocess_image does
+        arr = self._resize_array(arr, self.target_size or 1296)
+        
+        if min(arr.shape[:2]) < 3:
+            # Too small for the 3x3 OpenCV filters; PIL handles it
+            return self.preprocess_image(Image.fromarray(arr))
         
-        return processed_images
+        # Preprocess
+        return Image.fromarray(self._preprocess_array(arr))
     
     def get_image_info(self, image: Image.Image) -> dict:
         """